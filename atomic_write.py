@@ -0,0 +1,88 @@
+from contextlib import contextmanager
+import os
+
+# from fastest to safest:
+# "none" writes the file in place, a crash mid-write leaves it truncated
+# "flush" writes a temp file and renames it over the file, which survives a crash of the program
+# "fsync" also fsyncs the temp file before the rename, which survives a crash of the machine
+# "fsync+dirsync" also fsyncs the directory after the rename, so the rename itself is durable
+DURABILITY_LEVELS = ("none", "flush", "fsync", "fsync+dirsync")
+
+def check_durability(durability: str) -> None:
+    """
+    raises ValueError if durability is not one of DURABILITY_LEVELS
+    """
+    if durability not in DURABILITY_LEVELS:
+        raise ValueError("unknown durability level %r, expected one of %s" % (durability, ", ".join(DURABILITY_LEVELS)))
+
+def sync_file(file, durability: str) -> None:
+    """
+    flushes and, depending on durability, fsyncs an open file
+    """
+    if durability == "none":
+        return
+    file.flush()
+    if durability in ("fsync", "fsync+dirsync"):
+        os.fsync(file.fileno())
+
+def sync_directory(directory: str) -> None:
+    """
+    fsyncs a directory so that renames and new files in it are durable. does nothing where directories cannot be opened
+    """
+    if os.name == 'nt':
+        return
+    fd = os.open(directory, os.O_RDONLY | getattr(os, 'O_DIRECTORY', 0))
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+def create_temp_file(path: str) -> tuple[int, str]:
+    """
+    creates a new temp file next to path and returns its descriptor and path. it is created with the permissions
+    open gives a new file, so the umask of the process applies without being read
+    """
+    directory = os.path.dirname(path) or '.'
+    while True:
+        temp_path = os.path.join(directory, "%s.%s.tmp" % (os.path.basename(path), os.urandom(4).hex()))
+        try:
+            return os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666), temp_path
+        except FileExistsError:
+            continue
+
+def keep_mode(temp_path: str, path: str) -> None:
+    """
+    gives the temp file the permissions of path, if it exists
+    """
+    try:
+        mode = os.stat(path).st_mode & 0o7777
+    except FileNotFoundError:
+        return
+    os.chmod(temp_path, mode)
+
+@contextmanager
+def atomic_write(path: str, mode: str = 'w', durability: str = "fsync"):
+    """
+    opens a file for writing that replaces path only once it has been completely written,
+    so readers and crashes see either the old or the new content. the guarantees depend on durability.
+    the new file keeps the permissions of the file it replaces, or gets those open gives a new file
+    """
+    check_durability(durability)
+    if durability == "none":
+        with open(path, mode) as file:
+            yield file
+        return
+    directory = os.path.dirname(path) or '.'
+    fd, temp_path = create_temp_file(path)
+    try:
+        with os.fdopen(fd, mode) as file:
+            yield file
+            sync_file(file, durability)
+        keep_mode(temp_path, path)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    if durability == "fsync+dirsync":
+        sync_directory(directory)
@@ -0,0 +1,83 @@
+import queue
+import threading
+
+class BackgroundWriter:
+    """
+    runs the writes of daos on a single background thread, so the caller does not wait for the disk.
+    writes are queued by key, and a write submitted for a key that is still queued replaces the queued one,
+    so a burst of changes to the same record is written once. the queue holds at most max_pending keys,
+    beyond which submit blocks until the thread catches up.
+    an error raised by a write is kept and raised to the next caller of submit, after queueing its write, flush or close
+    """
+    def __init__(self, max_pending: int = 1000) -> None:
+        """
+        initializes a writer whose queue holds at most max_pending keys. the thread is started by the first submit
+        """
+        self.queue = queue.Queue(max_pending)
+        self.lock = threading.Lock()
+        # key -> the write waiting in the queue for that key
+        self.pending = {}
+        self.thread = None
+        self.error = None
+
+    def submit(self, key, write_function) -> None:
+        """
+        queues write_function to be called on the background thread, replacing any write still queued for key,
+        then raises the error of an earlier failed write, if any. the write is queued first, since the change it
+        persists has already been made in memory
+        """
+        with self.lock:
+            queued = key in self.pending
+            self.pending[key] = write_function
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, name="background-writer", daemon=True)
+                self.thread.start()
+        if not queued:
+            self.queue.put(key)
+        self.raise_error()
+
+    def run(self) -> None:
+        """
+        writes queued keys in order until close puts None in the queue
+        """
+        while True:
+            key = self.queue.get()
+            try:
+                if key is None:
+                    return
+                with self.lock:
+                    write_function = self.pending.pop(key, None)
+                if write_function is not None:
+                    write_function()
+            except Exception as error:
+                self.error = error
+            finally:
+                self.queue.task_done()
+
+    def flush(self) -> None:
+        """
+        waits until every queued write has been done, then raises the error of a failed write, if any
+        """
+        self.queue.join()
+        self.raise_error()
+
+    def close(self) -> None:
+        """
+        flushes and stops the background thread. a later submit starts a new one
+        """
+        with self.lock:
+            thread = self.thread
+            self.thread = None
+        if thread is not None:
+            self.queue.put(None)
+            thread.join()
+        self.raise_error()
+
+    def raise_error(self) -> None:
+        """
+        raises the error of a failed write, if any
+        """
+        if self.error is not None:
+            error = self.error
+            self.error = None
+            raise error
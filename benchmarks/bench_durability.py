@@ -0,0 +1,75 @@
+"""
+reports the write latency of each durability level of atomic_write, for a full rewrite of patients.json
+and for a single record appended to the patient log.
+
+run from the directory that contains the clinic package: python -m benchmarks.bench_durability
+"""
+from clinic.patient import Patient
+from clinic.dao.patient_encoder import PatientEncoder
+from clinic.dao.atomic_write import atomic_write, sync_file, DURABILITY_LEVELS
+import json
+import os
+import statistics
+import tempfile
+import time
+
+SIZES = [1000, 10000, 100000]
+REPEATS = 20
+
+def make_patients(count: int) -> list[Patient]:
+    """
+    returns count patients with realistic field lengths
+    """
+    return [Patient(9000000000 + i, "Patient Number %d" % i, "1980-01-01", "250 555 %04d" % (i % 10000),
+                    "patient%d@example.com" % i, "%d Main Street, Victoria BC" % i) for i in range(count)]
+
+def time_rewrite(path: str, patients: list[Patient], durability: str) -> list[float]:
+    """
+    returns the latencies in milliseconds of rewriting the whole patient file
+    """
+    latencies = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        with atomic_write(path, 'w', durability) as file:
+            for patient in patients:
+                json.dump(patient, file, cls=PatientEncoder)
+                file.write('\n')
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+def time_append(path: str, patient: Patient, durability: str) -> list[float]:
+    """
+    returns the latencies in milliseconds of appending one record to the log
+    """
+    latencies = []
+    for _ in range(REPEATS * 10):
+        start = time.perf_counter()
+        with open(path, 'a') as file:
+            json.dump({"op": "upsert", "patient": patient}, file, cls=PatientEncoder)
+            file.write('\n')
+            sync_file(file, durability)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+def report(label: str, latencies: list[float]) -> None:
+    """
+    prints the mean, median and 95th percentile of the latencies
+    """
+    p95 = statistics.quantiles(latencies, n=20)[-1]
+    print("%-40s mean %9.3f ms   p50 %9.3f ms   p95 %9.3f ms" % (label, statistics.mean(latencies), statistics.median(latencies), p95))
+
+def main() -> None:
+    """
+    runs the benchmark in a temporary directory
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        for size in SIZES:
+            patients = make_patients(size)
+            for durability in DURABILITY_LEVELS:
+                report("rewrite %d patients, %s" % (size, durability), time_rewrite(os.path.join(directory, "patients.json"), patients, durability))
+        patient = make_patients(1)[0]
+        for durability in DURABILITY_LEVELS:
+            report("append 1 log record, %s" % durability, time_append(os.path.join(directory, "patients.log"), patient, durability))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""
+compares fuzzy name search by comparing every name with the query, edit distance and soundex of every word,
+with the fuzzy name index.
+
+run from the directory that contains the clinic package: python -m benchmarks.bench_fuzzy_search
+"""
+from clinic.dao.fuzzy_name_index import FuzzyNameIndex, name_words, edit_distance, max_distance, soundex
+from clinic.search_key import search_key
+import random
+import time
+
+SIZES = [10000, 100000, 1000000]
+QUERIES = ["Jon Smyth", "Mari Garsia", "Katherine", "Wei Lee", "Ahmad Kahn", "Zzyzx"]
+REPEATS = 5
+SCAN_MAX_SIZE = 100000
+
+FIRST_NAMES = ["James", "Mary", "John", "Patricia", "Robert", "Jennifer", "Michael", "Linda", "David", "Elizabeth",
+               "Wei", "Li", "Priya", "Ahmed", "Fatima", "Olga", "Hiroshi", "Ana", "Chloe", "Mateo", "Catherine", "Maria"]
+LAST_NAMES = ["Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez", "Martinez",
+              "Nguyen", "Li", "Patel", "Khan", "Ivanova", "Tanaka", "Silva", "Anderson", "Thompson", "MacDonald"]
+SYLLABLES = ["ka", "ro", "vin", "sel", "ba", "mur", "ti", "dor", "len", "ga", "shi", "wen", "pol", "an", "ek", "ru"]
+
+def make_names(count: int) -> dict[int, str]:
+    """
+    returns count names, half of them with a common last name and half with one of thousands of made up ones
+    """
+    rng = random.Random(count)
+    names = {}
+    for i in range(count):
+        last = rng.choice(LAST_NAMES) if i % 2 else "".join(rng.choice(SYLLABLES) for j in range(rng.randint(2, 4)))
+        names[9000000000 + i] = "%s %s" % (rng.choice(FIRST_NAMES), last.capitalize())
+    return names
+
+def scan_search(names: dict[int, str], name: str, max_results: int) -> list[int]:
+    """
+    returns the phns of the names matching every word of name, comparing every word of every name with it
+    """
+    query = name_words(search_key(name))
+    scored = []
+    for phn, other in names.items():
+        words = name_words(search_key(other))
+        total = 0
+        for word in query:
+            costs = [distance for distance in (edit_distance(word, other_word) for other_word in words) if distance <= max_distance(word)]
+            costs += [1.5 for other_word in words if soundex(other_word) == soundex(word)]
+            if not costs:
+                break
+            total += min(costs)
+        else:
+            scored.append((total, phn))
+    return [phn for total, phn in sorted(scored)[:max_results]]
+
+def average_time(function, *args) -> float:
+    """
+    returns the average time of REPEATS calls of function in milliseconds
+    """
+    start = time.perf_counter()
+    for i in range(REPEATS):
+        function(*args)
+    return (time.perf_counter() - start) / REPEATS * 1000
+
+def main() -> None:
+    """
+    builds the index for each size and times every query, comparing with the scan for the smaller sizes
+    """
+    for size in SIZES:
+        names = make_names(size)
+        start = time.perf_counter()
+        index = FuzzyNameIndex()
+        for phn, name in names.items():
+            index.add(phn, search_key(name))
+        print("%7d patients   %d distinct words   index built in %.2f s" % (size, len(index.phns), time.perf_counter() - start))
+        for query in QUERIES:
+            hits = len(index.search(search_key(query), 10))
+            indexed = average_time(index.search, search_key(query), 10)
+            if size <= SCAN_MAX_SIZE:
+                start = time.perf_counter()
+                scan_search(names, query, 10)
+                scan = (time.perf_counter() - start) * 1000
+                print("    %-12s %3d hits   scan %10.2f ms   index %8.2f ms   speedup %7.1fx" % (query, hits, scan, indexed, scan / indexed))
+            else:
+                print("    %-12s %3d hits   index %8.2f ms" % (query, hits, indexed))
+
+if __name__ == '__main__':
+    main()
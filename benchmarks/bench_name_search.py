@@ -0,0 +1,62 @@
+"""
+compares substring name search by a linear scan, as retrieve_patients used to do, with the trigram name index,
+checking that both find the same number of patients.
+
+run from the directory that contains the clinic package: python -m benchmarks.bench_name_search
+"""
+from clinic.dao.name_index import NameTrigramIndex
+from clinic.search_key import search_key
+import random
+import time
+
+SIZES = [10000, 100000, 1000000]
+QUERIES = ["smith", "Garcia", "son", "Wei Li", "li", "zzz"]
+REPEATS = 5
+
+FIRST_NAMES = ["James", "Mary", "John", "Patricia", "Robert", "Jennifer", "Michael", "Linda", "David", "Elizabeth",
+               "Wei", "Li", "Priya", "Ahmed", "Fatima", "Olga", "Hiroshi", "Ana", "Chloe", "Mateo"]
+LAST_NAMES = ["Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez", "Martinez",
+              "Nguyen", "Li", "Patel", "Khan", "Ivanova", "Tanaka", "Silva", "Anderson", "Thompson", "MacDonald"]
+
+def make_names(count: int) -> dict[int, str]:
+    """
+    returns count names, made unique by a number so the index has to tell them apart
+    """
+    rng = random.Random(count)
+    return {9000000000 + i: "%s %s %d" % (rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES), i) for i in range(count)}
+
+def linear_search(names: dict[int, str], search_string: str) -> list[int]:
+    """
+    returns the phns whose name contains search_string the way retrieve_patients used to find them
+    """
+    return [phn for phn, name in names.items() if search_string.upper() in name.upper()]
+
+def average_time(function, *args) -> float:
+    """
+    returns the average time of REPEATS calls of function in milliseconds
+    """
+    start = time.perf_counter()
+    for i in range(REPEATS):
+        function(*args)
+    return (time.perf_counter() - start) / REPEATS * 1000
+
+def main() -> None:
+    """
+    builds the index for each size and times every query both ways
+    """
+    for size in SIZES:
+        names = make_names(size)
+        start = time.perf_counter()
+        index = NameTrigramIndex()
+        for phn, name in names.items():
+            index.add(phn, search_key(name))
+        print("%7d patients   index built in %.2f s" % (size, time.perf_counter() - start))
+        for query in QUERIES:
+            hits = len(index.search(query))
+            assert hits == len(linear_search(names, query)), "index and scan disagree on %r" % query
+            scan = average_time(linear_search, names, query)
+            indexed = average_time(index.search, query)
+            print("    %-10s %7d hits   scan %9.2f ms   index %9.2f ms   speedup %7.1fx" % (query, hits, scan, indexed, scan / indexed))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""
+compares the stored size of pickled note records and the time to compress and decompress them
+without compression, with zlib, with zlib and a preset dictionary trained on other records, and with lzma.
+
+run from the directory that contains the clinic package: python -m benchmarks.bench_note_compression
+"""
+from clinic.note import Note
+from clinic.dao.note_compressor import NoteCompressor, train_dictionary
+from pickle import dumps
+import random
+import time
+
+# notes per patient record
+SIZES = [1, 10, 100]
+RECORDS = 200
+TRAINING_RECORDS = 500
+
+SENTENCES = [
+    "Patient reports %s for the past %d days.",
+    "No history of %s in the family.",
+    "Blood pressure %d/%d, heart rate %d bpm, temperature %.1f C.",
+    "Prescribed %s %d mg twice daily, to be reviewed at the next appointment.",
+    "Patient was advised to monitor %s and return if symptoms worsen.",
+    "Follow-up in %d weeks to reassess %s.",
+    "Referred to %s for further assessment.",
+    "Lab results show %s within normal range.",
+]
+WORDS = ["headache", "nausea", "lower back pain", "fatigue", "shortness of breath", "chest pain", "dizziness",
+         "hypertension", "type 2 diabetes", "asthma", "amoxicillin", "ibuprofen", "metformin", "lisinopril",
+         "cardiology", "physiotherapy", "dermatology", "blood glucose", "cholesterol", "thyroid function"]
+
+def make_note(code: int, rng: random.Random) -> Note:
+    """
+    returns a note of a few sentences of clinical prose
+    """
+    sentences = []
+    for sentence in rng.sample(SENTENCES, rng.randint(3, 6)):
+        values = []
+        for directive in sentence.split("%")[1:]:
+            if directive[0] == "s":
+                values.append(rng.choice(WORDS))
+            elif directive[0] == "d":
+                values.append(rng.randint(1, 180))
+            else:
+                values.append(rng.uniform(36, 39))
+        sentences.append(sentence % tuple(values))
+    return Note(code, " ".join(sentences))
+
+def make_record(count: int, rng: random.Random) -> bytes:
+    """
+    returns the pickled notes of a patient with count notes, as NoteDAOPickle stores them
+    """
+    return dumps({code: make_note(code, rng) for code in range(1, count + 1)})
+
+def main() -> None:
+    """
+    compresses and decompresses records of each size with each compressor and prints the average per record
+    """
+    rng = random.Random(0)
+    dictionary = train_dictionary([make_record(rng.choice(SIZES), rng) for i in range(TRAINING_RECORDS)])
+    compressors = [("none", NoteCompressor()), ("zlib", NoteCompressor("zlib", 0)),
+                   ("zlib+dict", NoteCompressor("zlib", 0, dictionary=dictionary)), ("lzma", NoteCompressor("lzma", 0))]
+    print("dictionary of %d bytes trained on %d records" % (len(dictionary), TRAINING_RECORDS))
+    for size in SIZES:
+        records = [make_record(size, rng) for i in range(RECORDS)]
+        raw = sum(len(record) for record in records)
+        for name, compressor in compressors:
+            start = time.perf_counter()
+            compressed = [compressor.compress(record) for record in records]
+            compress_time = time.perf_counter() - start
+            start = time.perf_counter()
+            for data in compressed:
+                compressor.decompress(data)
+            decompress_time = time.perf_counter() - start
+            stored = sum(len(data) for data in compressed)
+            print("%4d notes  %-10s %9.0f bytes   ratio %5.2f   compress %8.1f us   decompress %8.1f us"
+                  % (size, name, stored / RECORDS, raw / stored, compress_time / RECORDS * 1e6, decompress_time / RECORDS * 1e6))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""
+compares a name and note search that upper-cases every stored string on each query, as retrieve_patients and
+retrieve_notes used to do, with one that compares the search keys precomputed on Patient and Note.
+reports the time of a query and the temporary strings it allocates.
+
+run from the directory that contains the clinic package: python -m benchmarks.bench_search_keys
+"""
+from clinic.note import Note
+from clinic.patient import Patient
+from clinic.search_key import search_key
+import random
+import sys
+import time
+
+SIZES = [10000, 100000]
+REPEATS = 5
+NAMES = ["James Smith", "María García", "Wei Li", "Zoë O'Brien", "Priya Patel", "Jörg Müller", "Ana Silva", "Hiroshi Tanaka"]
+SENTENCES = ["Patient reports headache and nausea.", "Follow-up in two weeks.", "Prescribed ibuprofen 400 mg.",
+             "Blood pressure within normal range.", "Referred to physiotherapy for lower back pain."]
+
+def upper_scan(values: list[str], search_string: str) -> list[int]:
+    """
+    returns the positions of the values containing search_string, upper-casing every value
+    """
+    return [i for i, value in enumerate(values) if search_string.upper() in value.upper()]
+
+def key_scan(keys: list[str], search_string: str) -> list[int]:
+    """
+    returns the positions of the values whose precomputed key contains the key of search_string
+    """
+    key = search_key(search_string)
+    return [i for i, value in enumerate(keys) if key in value]
+
+def average_time(function, *args) -> float:
+    """
+    returns the average time of REPEATS calls of function in milliseconds
+    """
+    start = time.perf_counter()
+    for i in range(REPEATS):
+        function(*args)
+    return (time.perf_counter() - start) / REPEATS * 1000
+
+def main() -> None:
+    """
+    times both searches over patient names and note texts of each size
+    """
+    rng = random.Random(0)
+    for size in SIZES:
+        patients = [Patient(i, "%s %d" % (rng.choice(NAMES), i), autosave=False) for i in range(size)]
+        notes = [Note(i, " ".join(rng.sample(SENTENCES, 3))) for i in range(size)]
+        for label, values, keys, query in [("names", [patient.get_name() for patient in patients],
+                                            [patient.get_name_key() for patient in patients], "smith"),
+                                           ("notes", [note.get_text() for note in notes],
+                                            [note.get_search_key() for note in notes], "back pain")]:
+            allocated = sum(sys.getsizeof(value.upper()) for value in values)
+            upper = average_time(upper_scan, values, query)
+            precomputed = average_time(key_scan, keys, query)
+            print("%7d %s   upper() %8.2f ms, %6.1f MB of temporary strings   keys %8.2f ms, 0 MB   speedup %.1fx"
+                  % (size, label, upper, allocated / 1e6, precomputed, upper / precomputed))
+
+if __name__ == '__main__':
+    main()
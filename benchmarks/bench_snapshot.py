@@ -0,0 +1,61 @@
+"""
+compares loading the patient directory from line-delimited json and from the binary snapshot format.
+
+run from the directory that contains the clinic package: python -m benchmarks.bench_snapshot
+"""
+from clinic.patient import Patient
+from clinic.dao.patient_decoder import PatientDecoder
+from clinic.dao.patient_encoder import PatientEncoder
+from clinic.dao.patient_snapshot import read_snapshot, write_snapshot
+import json
+import os
+import tempfile
+import time
+
+SIZES = [10000, 100000, 500000]
+
+def make_patients(count: int) -> list[Patient]:
+    """
+    returns count patients with realistic field lengths
+    """
+    return [Patient(9000000000 + i, "Patient Number %d" % i, "1980-01-01", "250 555 %04d" % (i % 10000),
+                    "patient%d@example.com" % i, "%d Main Street, Victoria BC" % i) for i in range(count)]
+
+def load_json(path: str) -> dict[int, Patient]:
+    """
+    loads patients the way PatientDAOJSON.load_patients does
+    """
+    patients = {}
+    with open(path, 'r') as file:
+        decoder = PatientDecoder()
+        for line in file:
+            patient = json.loads(line.strip(), object_hook=decoder.object_hook)
+            patients[patient.phn] = patient
+    return patients
+
+def main() -> None:
+    """
+    writes both formats for each size and times loading them back
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        json_path = os.path.join(directory, "patients.json")
+        snapshot_path = os.path.join(directory, "patients.snap")
+        for size in SIZES:
+            patients = make_patients(size)
+            with open(json_path, 'w') as file:
+                for patient in patients:
+                    json.dump(patient, file, cls=PatientEncoder)
+                    file.write('\n')
+            write_snapshot(snapshot_path, patients, "flush")
+            start = time.perf_counter()
+            load_json(json_path)
+            json_time = time.perf_counter() - start
+            start = time.perf_counter()
+            read_snapshot(snapshot_path)
+            snapshot_time = time.perf_counter() - start
+            print("%7d patients   json %8.1f ms (%6.1f MB)   binary %8.1f ms (%6.1f MB)   speedup %.1fx"
+                  % (size, json_time * 1000, os.path.getsize(json_path) / 1e6, snapshot_time * 1000,
+                     os.path.getsize(snapshot_path) / 1e6, json_time / snapshot_time))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,168 @@
+from .note_index import tokenize
+from clinic.search_key import search_key
+from .atomic_write import atomic_write
+from collections import Counter
+from pickle import dump, load, HIGHEST_PROTOCOL, UnpicklingError
+import heapq
+import math
+import os
+import re
+
+VERSION = 1
+SNIPPET_BEFORE = 30
+SNIPPET_LENGTH = 100
+
+class ClinicNoteIndex:
+    """
+    a full-text index over the notes of every patient, mapping each normalized word to the (phn, code) of the notes
+    holding it and how often it occurs in each. the text of every note is kept for snippets,
+    so a search never has to load a patient record.
+    the index is loaded from its file, or built from every record, on the first search. changes are applied as they
+    happen once it is loaded. the file is removed on the first change after it was written and written again by save,
+    so an index file left behind by a crash is never out of date
+    """
+    def __init__(self, path: str = None) -> None:
+        """
+        initializes an index saved at path, or kept only in memory if path is None
+        """
+        self.path = path
+        self.loaded = False
+        self.saved = path is not None and os.path.exists(path)
+        self.dirty = False
+        # word -> (phn, code) -> number of occurrences of the word in the note
+        self.postings = {}
+        # (phn, code) -> text of the note
+        self.texts = {}
+        # phn -> codes of the notes of the patient
+        self.codes = {}
+
+    def ensure_loaded(self, notes) -> None:
+        """
+        loads the index from its file, or builds it from notes, an iterable of (phn, code, text) covering every note,
+        unless it is already loaded
+        """
+        if self.loaded:
+            return
+        if self.saved:
+            try:
+                with open(self.path, 'rb') as file:
+                    version, self.texts = load(file)
+                if version == VERSION:
+                    self.loaded = True
+            except (EOFError, ValueError, UnpicklingError):
+                pass
+        if self.loaded:
+            for (phn, code), text in self.texts.items():
+                self.index_note(phn, code, text)
+            self.dirty = False
+        else:
+            self.texts = {}
+            for phn, code, text in notes:
+                self.texts[(phn, code)] = text
+                self.index_note(phn, code, text)
+            self.loaded = True
+            self.dirty = True
+
+    def changed(self) -> None:
+        """
+        records a change, removing the index file since it no longer matches the notes
+        """
+        if self.saved:
+            os.remove(self.path)
+            self.saved = False
+        self.dirty = True
+
+    def save(self) -> None:
+        """
+        writes the index to its file, if it is loaded and has changed. only the note texts are written,
+        the postings are rebuilt from them when the file is loaded
+        """
+        if self.path is None or not self.loaded or not self.dirty:
+            return
+        with atomic_write(self.path, 'wb', "flush") as file:
+            dump((VERSION, self.texts), file, HIGHEST_PROTOCOL)
+        self.saved = True
+        self.dirty = False
+
+    def index_note(self, phn: int, code: int, text: str) -> None:
+        """
+        adds the words of a note to the postings
+        """
+        for word, count in Counter(tokenize(search_key(text))).items():
+            self.postings.setdefault(word, {})[(phn, code)] = count
+        self.codes.setdefault(phn, set()).add(code)
+
+    def unindex_note(self, phn: int, code: int) -> None:
+        """
+        removes a note from the postings and texts
+        """
+        text = self.texts.pop((phn, code), None)
+        if text is None:
+            return
+        for word in set(tokenize(search_key(text))):
+            notes = self.postings.get(word)
+            if notes is not None:
+                notes.pop((phn, code), None)
+                if not notes:
+                    del self.postings[word]
+        self.codes[phn].discard(code)
+        if not self.codes[phn]:
+            del self.codes[phn]
+
+    def add_note(self, phn: int, code: int, text: str) -> None:
+        """
+        adds a created note, or replaces an updated one
+        """
+        self.changed()
+        if self.loaded:
+            self.unindex_note(phn, code)
+            self.texts[(phn, code)] = text
+            self.index_note(phn, code, text)
+
+    def remove_note(self, phn: int, code: int) -> None:
+        """
+        removes a deleted note
+        """
+        self.changed()
+        if self.loaded:
+            self.unindex_note(phn, code)
+
+    def remove_patient(self, phn: int) -> None:
+        """
+        removes every note of a patient
+        """
+        self.changed()
+        if self.loaded:
+            for code in list(self.codes.get(phn, ())):
+                self.unindex_note(phn, code)
+
+    def snippet(self, text: str, words: list[str]) -> str:
+        """
+        returns the part of text around the first occurrence of any of words, on one line
+        """
+        starts = [match.start() for match in (re.search(re.escape(word), text, re.IGNORECASE) for word in words) if match is not None]
+        start = max(min(starts, default=0) - SNIPPET_BEFORE, 0)
+        snippet = " ".join(text[start:start + SNIPPET_LENGTH].split())
+        if start > 0:
+            snippet = "..." + snippet
+        if start + SNIPPET_LENGTH < len(text):
+            snippet = snippet + "..."
+        return snippet
+
+    def search(self, query: str, limit: int = 20) -> list[tuple[int, int, str]]:
+        """
+        returns the (phn, code, snippet) of at most limit notes containing every word of query, best match first.
+        notes are ranked by tf-idf, so rare words and notes repeating them count the most
+        """
+        words = list(dict.fromkeys(tokenize(search_key(query))))
+        if not words or not all(word in self.postings for word in words):
+            return []
+        words.sort(key=lambda word: len(self.postings[word]))
+        notes = set(self.postings[words[0]])
+        for word in words[1:]:
+            notes.intersection_update(self.postings[word])
+        total = len(self.texts)
+        weights = [(self.postings[word], math.log(1 + total / len(self.postings[word]))) for word in words]
+        scored = ((sum(postings[note] * weight for postings, weight in weights), note) for note in notes)
+        best = heapq.nsmallest(limit, scored, key=lambda hit: (-hit[0], hit[1]))
+        return [(phn, code, self.snippet(self.texts[(phn, code)], words)) for score, (phn, code) in best]
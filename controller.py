@@ -1,251 +1,544 @@
-from .patient import Patient
-from .patient_record import PatientRecord
-from .note import Note
-from .dao.patient_dao_json import PatientDAOJSON
-from .exception.invalid_logout_exception import InvalidLogoutException
-from .exception.invalid_login_exception import InvalidLoginException
-from .exception.duplicate_login_exception import DuplicateLoginException
-from .exception.illegal_access_exception import IllegalAccessException
-from .exception.illegal_operation_exception import IllegalOperationException
-from .exception.no_current_patient_exception import NoCurrentPatientException
-import hashlib
-
-class Controller:
-        def __init__(self, autosave: bool) -> None:
-            """
-            initializes attributions of Controller instance
-            """
-            if autosave == False:
-                self.users = {
-                    "user": "8d969eef6ecad3c29a3a629280e686cf0c3f5d5a86aff3ca12020c923adc6c92", 
-                    "ali": "6394ffec21517605c1b426d43e6fa7eb0cff606ded9c2956821c2c36bfee2810",
-                    "kala": "e5268ad137eec951a48a5e5da52558c7727aaa537c8b308b5e403e6b434e036e"
-                    }
-            else:
-                self.users = {}
-                try:
-                    with open('clinic/users.txt', 'r') as file:
-                        for line in file:
-                                key, value = line.strip().split(",", 1)
-                                self.users[key] = value
-                except FileNotFoundError:
-                    print("file not found")
-            self.logged_on = False
-            self.patients_dao = PatientDAOJSON(autosave)
-            self.current_patient = None
-            self.autosave = autosave
-
-        def get_password_hash(self, password: str) -> str:
-            """
-            hashes a password and returns the resulting string
-            """
-            encoded_password = password.encode('utf-8')    
-            hash_object = hashlib.sha256(encoded_password)    
-            hex_dig = hash_object.hexdigest()      
-            return hex_dig
-
-        def login(self, username: str, password: str) -> bool:
-            """
-            if not self.logged_on and both correct username and password are given, sets self.logged to True and returns True, 
-            otherwise exception is raised
-            """
-            if self.logged_on:
-                raise DuplicateLoginException("duplicate login exception")
-            else:
-                if username in self.users and self.users.get(username) == self.get_password_hash(password):
-                    self.logged_on = True
-                    return True
-                else:
-                    raise InvalidLoginException("invalid login exception raised")
-
-        def logout(self) -> bool:
-            """
-            if self.logged_on, sets self.logged_on to False and returns True
-            otherwise exception is raised
-            """
-            if not self.logged_on:
-                raise InvalidLogoutException("invalid logout exception")
-            else:
-                self.logged_on = False
-                return True
-
-        def create_patient(self, phn: int, name: str, bday: str, phone: str, email: str, address: str)-> Patient:
-            """
-            if self.logged_on and phn DNE, calls and returns PatientDAOJSON create_patient method
-            otherwise, exception is raised
-            """
-            if not self.logged_on:
-                raise IllegalAccessException("illegal access exception")
-            if self.patients_dao.search_patient(phn) is not None:
-                raise IllegalOperationException("illegal operation exception")
-            new = Patient(phn, name, bday, phone, email, address, self.autosave)
-            self.patients_dao.create_patient(new)
-            return new
-            
-        def search_patient(self, phn: int)-> Patient:
-            """
-            if found, calls and returns PatientDAOJSON search_patient method
-            otherwise, exception is raised
-            """
-            if not self.logged_on:
-                raise IllegalAccessException("illegal access exception")
-            return self.patients_dao.search_patient(phn)
-        
-        def retrieve_patients(self, name: str)-> list[Patient]:
-            """
-            if logged on, calls and returns PatientDAOJSON retrieve_patients method
-            otherwise, exception is raised
-            """
-            if not self.logged_on:
-                raise IllegalAccessException("illegal access exception")
-            return self.patients_dao.retrieve_patients(name)
-            
-        def update_patient(self, phn1: int, phn2: int, name: str, bday: str, phone: str, email: str, address: str)-> bool:
-            """
-            if self.logged_on, the patient exists, and the new phn doesn't already exist, calls and returns PatientDAOJSON update_patient method
-            otherwise, exception is raised
-            """
-            if not self.logged_on:
-                raise IllegalAccessException("illegal access exception")
-            if self.patients_dao.search_patient(phn1) is None:
-                raise IllegalOperationException("illegal operation exception")
-            if phn1 != phn2 and self.patients_dao.search_patient(phn2) is not None:
-                raise IllegalOperationException("illegal operation exception")
-            elif self.current_patient is not None and phn1 == self.current_patient.get_phn():
-                raise IllegalOperationException("illegal operation exception")
-            cur = self.patients_dao.search_patient(phn1)
-            cur.set_phn(phn2)
-            cur.set_name(name)
-            cur.set_bday(bday)
-            cur.set_phone(phone)
-            cur.set_email(email)
-            cur.set_address(address)
-            return self.patients_dao.update_patient(phn1, cur)
-            
-        def list_patients(self)-> list[Patient]:
-            """
-            if self.logged_on, calls and returns PatientDAOJSON list_patient method.
-            otherwise, exception is raised
-            """
-            if not self.logged_on:
-                raise IllegalAccessException("illegal access exception")
-            return self.patients_dao.list_patients()
-
-        def delete_patient(self, phn: int)-> bool:
-            """
-            if self.logged_on, and given phn is a valid phn but not the self.current_patient phn, calls and returns PatientDAOJSON delete_patient method
-            otherwise, exception is raised
-            """
-            if not self.logged_on:
-                raise IllegalAccessException("illegal access exception")
-            if self.current_patient is not None and self.current_patient.get_phn() == phn or self.patients_dao.search_patient(phn) is None:
-                raise IllegalOperationException("illegal operation exception")
-            return self.patients_dao.delete_patient(phn)
-
-        def set_current_patient(self, phn: int)-> None:
-            """
-            if self.logged_on and given phn is a valid patient, sets the corresponding patient to self.current_patient
-            otherwise, exception is raised
-            """
-            if not self.logged_on:
-                raise IllegalAccessException("illegal access exception")
-            pat = self.patients_dao.search_patient(phn)
-            if pat is None:
-                raise IllegalOperationException("illegal operation exception")
-            self.current_patient = pat
-
-        def get_current_patient(self)-> Patient:
-            """
-            if self.logged_on with a valid current patient, returns self.current_patient,
-            otherwise, an exception is raised or, if there is no current patient, returns None
-            """
-            if not self.logged_on:
-                raise IllegalAccessException("illegal access exception")
-            if self.current_patient is None:
-                return None
-            return self.current_patient
-
-        def unset_current_patient(self)-> None:
-            """
-            if logged on, sets self.current_patient to None.
-            otherwise, exception is raised.
-            """
-            if not self.logged_on:
-                raise IllegalAccessException("illegal access exception")
-            self.current_patient = None
-
-        def create_note(self, text: str)-> Note:
-            """
-            if self.logged_on and valid self.current_patient, calls and returns create_note function from Patient class
-            otherwise, exception is raised
-            """
-            if not self.logged_on:
-                raise IllegalAccessException("illegal access exception")
-            if self.current_patient is None:
-                raise NoCurrentPatientException("no current patient exception")
-            return self.current_patient.create_note(text)
-
-        def search_note(self, code: int)-> Note:
-            """
-            if self.logged_on and valid self.current_patient, calls and returns search_note function from Patient class
-            otherwise, exception is raised
-            """
-            if not self.logged_on:
-                raise IllegalAccessException("illegal access exception")
-            if self.current_patient is None:
-                raise NoCurrentPatientException("no current patient exception")
-            return self.current_patient.search_note(code)
-
-        def retrieve_notes(self, keyword: str)-> list[Note]:
-            """
-            if self.logged_on and valid self.current_patient, calls and returns retrieve_notes function from Patient class
-            otherwise, exception is raised
-            """
-            if not self.logged_on:
-                raise IllegalAccessException("illegal access exception")
-            if self.current_patient is None:
-                raise NoCurrentPatientException("no current patient exception")
-            return self.current_patient.retrieve_notes(keyword)      
-
-        def update_note(self, code: int, text: str)-> bool:
-            """
-            if self.logged_on and valid self.current_patient, calls and returns update_note function from Patient class
-            otherwise, exception is raised
-            """
-            if not self.logged_on:
-                raise IllegalAccessException("illegal access exception")
-            if self.current_patient is None:
-                raise NoCurrentPatientException("no current patient exception")
-            return self.current_patient.update_note(code, text)
-
-        def delete_note(self, code: int)-> bool:
-            """
-            if self.logged_on and valid self.current_patient, calls and returns delete_note function from Patient class
-            otherwise, exception is raised
-            """
-            if not self.logged_on:
-                raise IllegalAccessException("illegal access exception")
-            if self.current_patient is None:
-                raise NoCurrentPatientException("no current patient exception")
-            return self.current_patient.delete_note(code)
-
-        def list_notes(self)-> list[Note]:
-            """
-            if self.logged_on and valid self.current_patient, calls and returns list_notes function from Patient class
-            otherwise, exception is raised
-            """
-            if not self.logged_on:
-                raise IllegalAccessException("illegal access exception")
-            if self.current_patient is None:
-                raise NoCurrentPatientException("no current patient exception")
-            return self.current_patient.list_notes()
-                
-            
-
-            
-
-
-            
-
-
+from .patient import Patient
+from .patient_record import PatientRecord
+from .note import Note
+from .dao.patient_dao_json import PatientDAOJSON
+from .dao.patient_dao_sqlite import PatientDAOSQLite
+from .dao.note_dao_pickle import NoteDAOPickle
+from .dao.note_dao_journal import NoteDAOJournal
+from .dao.note_dao_segment import NoteDAOSegment
+from .dao.note_segment_store import NoteSegmentStore
+from .dao.background_writer import BackgroundWriter
+from .dao.note_compressor import NoteCompressor, read_dictionary
+from .dao.clinic_note_index import ClinicNoteIndex
+from .dao.search_cache import SearchCache
+from .dao.group_commit import GroupCommit
+from .dao.patient_encoder import PatientEncoder
+from .exception.invalid_logout_exception import InvalidLogoutException
+from .exception.invalid_login_exception import InvalidLoginException
+from .exception.duplicate_login_exception import DuplicateLoginException
+from .exception.illegal_access_exception import IllegalAccessException
+from .exception.illegal_operation_exception import IllegalOperationException
+from .exception.no_current_patient_exception import NoCurrentPatientException
+from functools import partial
+import csv
+import hashlib
+import json
+
+# the ways the json patient directory can store notes, see the note_storage argument of Controller
+NOTE_STORAGES = ("pickle", "journal", "segment")
+
+class Controller:
+        def __init__(self, autosave: bool, log_structured: bool = False, storage: str = "json", indexed: bool = False,
+                     group_commit: bool = False, max_delay: float = 1.0, max_batch: int = 100, durability: str = "fsync",
+                     snapshot_format: str = "json", load_workers: int = 0, note_storage: str = "pickle",
+                     background_writes: bool = False, write_queue_size: int = 1000, note_compression: str = "none",
+                     compression_threshold: int = 256, compression_dictionary: str = None, search_cache_size: int = 128) -> None:
+            """
+            initializes attributions of Controller instance.
+            storage selects the patient directory, either "json" (with notes in pickle files) or "sqlite".
+            log_structured selects the append-only log mode of the json patient directory,
+            indexed selects its memory mapped mode where patients are decoded on access.
+            group_commit batches the writes of the json patient directory and the pickle note files,
+            flushing after max_delay seconds or max_batch changes, on logout and at interpreter exit.
+            durability is one of "none", "flush", "fsync" or "fsync+dirsync" and trades write latency for crash safety.
+            snapshot_format is "json" or "binary" and selects the file format of the json patient directory,
+            load_workers is the number of processes that decode a large patients.json at startup.
+            note_storage selects how the json patient directory stores notes, either "pickle" (one .dat file per patient, rewritten
+            on every change), "journal" (one append-only .jnl file per patient) or "segment" (a few large segment files shared by all patients).
+            background_writes moves the note writes of the json patient directory to a background thread, queueing at most
+            write_queue_size patients. they are flushed when the current patient is unset and on logout.
+            note_compression is "none", "zlib" or "lzma" and compresses the stored notes of patients whose pickled notes
+            take at least compression_threshold bytes. compression_dictionary is the path of a zlib preset dictionary
+            made with train_dictionary.
+            the results of the last search_cache_size name searches and note keyword searches are cached until the patients
+            or the searched notes change, 0 turns the caches off
+            """
+            if note_storage not in NOTE_STORAGES:
+                raise ValueError("unknown note storage %r, expected one of %s" % (note_storage, ", ".join(NOTE_STORAGES)))
+            if autosave == False:
+                self.users = {
+                    "user": "8d969eef6ecad3c29a3a629280e686cf0c3f5d5a86aff3ca12020c923adc6c92", 
+                    "ali": "6394ffec21517605c1b426d43e6fa7eb0cff606ded9c2956821c2c36bfee2810",
+                    "kala": "e5268ad137eec951a48a5e5da52558c7727aaa537c8b308b5e403e6b434e036e"
+                    }
+            else:
+                self.users = {}
+                try:
+                    with open('clinic/users.txt', 'r') as file:
+                        for line in file:
+                                key, value = line.strip().split(",", 1)
+                                self.users[key] = value
+                except FileNotFoundError:
+                    print("file not found")
+            self.logged_on = False
+            self.writer = None
+            self.patient_search_cache = SearchCache(search_cache_size)
+            self.note_search_cache = SearchCache(search_cache_size)
+            if storage == "sqlite":
+                self.patients_dao = PatientDAOSQLite(autosave, durability=durability, search_cache=self.patient_search_cache,
+                                                     note_search_cache=self.note_search_cache)
+            else:
+                note_store = None
+                if background_writes and autosave:
+                    self.writer = BackgroundWriter(write_queue_size)
+                dictionary = None
+                if compression_dictionary is not None:
+                    dictionary = read_dictionary(compression_dictionary)
+                compressor = NoteCompressor(note_compression, compression_threshold, dictionary=dictionary)
+                if note_storage == "segment":
+                    if autosave:
+                        note_store = NoteSegmentStore(durability=durability)
+                    note_dao_factory = partial(NoteDAOSegment, store=note_store, group_commit=group_commit, max_delay=max_delay,
+                                               max_batch=max_batch, durability=durability, writer=self.writer, compressor=compressor,
+                                               search_cache=self.note_search_cache)
+                else:
+                    if note_storage == "journal":
+                        note_dao_class = NoteDAOJournal
+                    else:
+                        note_dao_class = NoteDAOPickle
+                    note_dao_factory = partial(note_dao_class, group_commit=group_commit, max_delay=max_delay, max_batch=max_batch,
+                                               durability=durability, writer=self.writer, compressor=compressor,
+                                               search_cache=self.note_search_cache)
+                self.patients_dao = PatientDAOJSON(autosave, log_structured, note_dao_factory=note_dao_factory, indexed=indexed,
+                                                   group_commit=group_commit, max_delay=max_delay, max_batch=max_batch, durability=durability,
+                                                   snapshot_format=snapshot_format, load_workers=load_workers, note_store=note_store,
+                                                   search_cache=self.patient_search_cache)
+            self.current_patient = None
+            self.autosave = autosave
+            self.note_search = ClinicNoteIndex('clinic/notes.idx' if autosave else None)
+
+        def get_password_hash(self, password: str) -> str:
+            """
+            hashes a password and returns the resulting string
+            """
+            encoded_password = password.encode('utf-8')    
+            hash_object = hashlib.sha256(encoded_password)    
+            hex_dig = hash_object.hexdigest()      
+            return hex_dig
+
+        def login(self, username: str, password: str) -> bool:
+            """
+            if not self.logged_on and both correct username and password are given, sets self.logged to True and returns True, 
+            otherwise exception is raised
+            """
+            if self.logged_on:
+                raise DuplicateLoginException("duplicate login exception")
+            else:
+                if username in self.users and self.users.get(username) == self.get_password_hash(password):
+                    self.logged_on = True
+                    return True
+                else:
+                    raise InvalidLoginException("invalid login exception raised")
+
+        def logout(self) -> bool:
+            """
+            if self.logged_on, flushes any pending writes and stops the background writer, sets self.logged_on to False and returns True
+            otherwise exception is raised. an error of a background write is raised here
+            """
+            if not self.logged_on:
+                raise InvalidLogoutException("invalid logout exception")
+            else:
+                if self.writer is not None:
+                    self.writer.close()
+                GroupCommit.flush_all()
+                self.note_search.save()
+                self.logged_on = False
+                return True
+
+        def create_patient(self, phn: int, name: str, bday: str, phone: str, email: str, address: str)-> Patient:
+            """
+            if self.logged_on and phn DNE, calls and returns PatientDAOJSON create_patient method
+            otherwise, exception is raised
+            """
+            if not self.logged_on:
+                raise IllegalAccessException("illegal access exception")
+            if self.patients_dao.search_patient(phn) is not None:
+                raise IllegalOperationException("illegal operation exception")
+            new = Patient(phn, name, bday, phone, email, address, self.autosave, self.patients_dao.note_dao_factory)
+            self.patients_dao.create_patient(new)
+            return new
+            
+        def import_patients(self, rows, format: str = "csv", checkpoint: int = 0)-> tuple[int, list[tuple[int, str]]]:
+            """
+            if self.logged_on, creates patients from a stream of csv lines (with a header row) or jsonl lines,
+            each having the fields phn, name, birth_date, phone, email and address.
+            rows with missing fields, a bad phn or a phn that already exists are skipped and reported, without stopping the import.
+            patients are persisted once at the end, or every checkpoint patients if checkpoint is positive.
+            returns the number of imported patients and a list of (row number, error message)
+            otherwise, exception is raised
+            """
+            if not self.logged_on:
+                raise IllegalAccessException("illegal access exception")
+            if format == "csv":
+                records = csv.DictReader(rows)
+            elif format == "jsonl":
+                records = iter(rows)
+            else:
+                raise ValueError("unknown import format %r" % format)
+            fields = ["phn", "name", "birth_date", "phone", "email", "address"]
+            imported = 0
+            errors = []
+            seen = set()
+            batch = []
+            row_number = 0
+            while True:
+                row_number += 1
+                try:
+                    record = next(records)
+                except StopIteration:
+                    break
+                except csv.Error as error:
+                    errors.append((row_number, "could not be parsed: %s" % error))
+                    continue
+                if format == "jsonl":
+                    if not record.strip():
+                        continue
+                    try:
+                        record = json.loads(record)
+                    except json.JSONDecodeError as error:
+                        errors.append((row_number, "could not be parsed: %s" % error))
+                        continue
+                missing = [field for field in fields if not isinstance(record, dict) or record.get(field) is None]
+                if missing:
+                    errors.append((row_number, "missing field(s) %s" % ", ".join(missing)))
+                    continue
+                try:
+                    phn = int(record["phn"])
+                except (TypeError, ValueError):
+                    errors.append((row_number, "invalid phn %r" % record["phn"]))
+                    continue
+                if phn in seen or self.patients_dao.search_patient(phn) is not None:
+                    errors.append((row_number, "duplicate phn %d" % phn))
+                    continue
+                seen.add(phn)
+                batch.append(Patient(phn, str(record["name"]), str(record["birth_date"]), str(record["phone"]), str(record["email"]),
+                                     str(record["address"]), self.autosave, self.patients_dao.note_dao_factory))
+                if checkpoint > 0 and len(batch) >= checkpoint:
+                    self.patients_dao.create_patients(batch)
+                    imported += len(batch)
+                    batch = []
+            if batch:
+                self.patients_dao.create_patients(batch)
+                imported += len(batch)
+            return imported, errors
+
+        def export_records(self):
+            """
+            yields the patients and, after each patient, its notes in creation order, as dictionaries.
+            the note dao of each patient is only kept while its notes are exported, unless it was already loaded
+            """
+            encoder = PatientEncoder()
+            for patient in self.patients_dao.iter_patients():
+                yield encoder.default(patient)
+                record = patient.get_patient_rec()
+                loaded = record.loaded_note_dao is not None
+                for note in record.get_notes().values():
+                    yield {"__type__": "Note", "phn": patient.get_phn(), "code": note.get_note_num(),
+                           "timestamp": note.get_time().isoformat(), "text": note.get_text()}
+                if not loaded:
+                    record.release_note_dao()
+
+        def iter_all_notes(self):
+            """
+            yields the (phn, code, text) of the notes of every patient, keeping the note dao of each patient only while
+            its notes are read, unless it was already loaded
+            """
+            for patient in self.patients_dao.iter_patients():
+                record = patient.get_patient_rec()
+                loaded = record.loaded_note_dao is not None
+                for note in record.get_notes().values():
+                    yield (patient.get_phn(), note.get_note_num(), note.get_text())
+                if not loaded:
+                    record.release_note_dao()
+
+        def search_all_notes(self, query: str, limit: int = 20)-> list[tuple[int, int, str]]:
+            """
+            if self.logged_on, returns the (phn, note code, snippet) of at most limit notes of any patient containing
+            every word of query, best match first. the first search loads the clinic-wide note index, or builds it
+            by reading every patient record once
+            otherwise, exception is raised
+            """
+            if not self.logged_on:
+                raise IllegalAccessException("illegal access exception")
+            self.note_search.ensure_loaded(self.iter_all_notes())
+            return self.note_search.search(query, limit)
+
+        def export(self, stream, format: str = "jsonl")-> int:
+            """
+            if self.logged_on, writes every patient followed by its notes to stream, one record at a time, as jsonl
+            or as csv with a record_type column. returns the number of records written
+            otherwise, exception is raised
+            """
+            if not self.logged_on:
+                raise IllegalAccessException("illegal access exception")
+            count = 0
+            if format == "jsonl":
+                for record in self.export_records():
+                    stream.write(json.dumps(record) + "\n")
+                    count += 1
+            elif format == "csv":
+                writer = csv.DictWriter(stream, ["record_type", "phn", "name", "birth_date", "phone", "email", "address", "code", "timestamp", "text"])
+                writer.writeheader()
+                for record in self.export_records():
+                    record["record_type"] = record.pop("__type__")
+                    writer.writerow(record)
+                    count += 1
+            else:
+                raise ValueError("unknown export format %r" % format)
+            return count
+
+        def search_patient(self, phn: int)-> Patient:
+            """
+            if found, calls and returns PatientDAOJSON search_patient method
+            otherwise, exception is raised
+            """
+            if not self.logged_on:
+                raise IllegalAccessException("illegal access exception")
+            return self.patients_dao.search_patient(phn)
+        
+        def retrieve_patients(self, name: str)-> list[Patient]:
+            """
+            if logged on, calls and returns PatientDAOJSON retrieve_patients method
+            otherwise, exception is raised
+            """
+            if not self.logged_on:
+                raise IllegalAccessException("illegal access exception")
+            return self.patients_dao.retrieve_patients(name)
+
+        def fuzzy_search_patients(self, name: str, max_results: int = 10)-> list[Patient]:
+            """
+            if logged on, returns at most max_results patients whose name matches name despite misspellings,
+            such as "Jon Smyth" for "John Smith", best match first
+            otherwise, exception is raised
+            """
+            if not self.logged_on:
+                raise IllegalAccessException("illegal access exception")
+            return self.patients_dao.fuzzy_search_patients(name, max_results)
+
+        def query_patients(self, **predicates)-> list[Patient]:
+            """
+            if logged on, returns the patients satisfying every given predicate, in phn order:
+            name (contained in the name), phone (same digits), phone_ends_with, email (ignoring case),
+            born_from and born_to ("YYYY-MM-DD", included) and born_in (a year).
+            the most selective index gives the candidates, which the other predicates then narrow down
+            otherwise, exception is raised
+            """
+            if not self.logged_on:
+                raise IllegalAccessException("illegal access exception")
+            return self.patients_dao.query_patients(predicates)
+
+        def explain_query(self, **predicates)-> list[str]:
+            """
+            if logged on, returns the plan of query_patients with the given predicates, one line per step
+            otherwise, exception is raised
+            """
+            if not self.logged_on:
+                raise IllegalAccessException("illegal access exception")
+            return self.patients_dao.explain_query(predicates)
+
+        def search_cache_stats(self)-> dict[str, dict[str, int]]:
+            """
+            returns the hits, misses and size of the cache of name searches under "patients",
+            and of the cache of note keyword searches under "notes"
+            """
+            return {"patients": self.patient_search_cache.stats(), "notes": self.note_search_cache.stats()}
+
+        def find_by_phone(self, phone: str)-> list[Patient]:
+            """
+            if logged on, returns the patients with the given phone number, comparing only its digits
+            otherwise, exception is raised
+            """
+            if not self.logged_on:
+                raise IllegalAccessException("illegal access exception")
+            return self.patients_dao.find_by_phone(phone)
+
+        def find_by_email(self, email: str)-> list[Patient]:
+            """
+            if logged on, returns the patients with the given email address, ignoring case
+            otherwise, exception is raised
+            """
+            if not self.logged_on:
+                raise IllegalAccessException("illegal access exception")
+            return self.patients_dao.find_by_email(email)
+
+        def range_by_birth_date(self, start: str, end: str)-> list[Patient]:
+            """
+            if logged on, returns the patients born from start to end, both included and given as "YYYY-MM-DD",
+            oldest first
+            otherwise, exception is raised
+            """
+            if not self.logged_on:
+                raise IllegalAccessException("illegal access exception")
+            return self.patients_dao.range_by_birth_date(start, end)
+            
+        def update_patient(self, phn1: int, phn2: int, name: str, bday: str, phone: str, email: str, address: str)-> bool:
+            """
+            if self.logged_on, the patient exists, and the new phn doesn't already exist, calls and returns PatientDAOJSON update_patient method
+            otherwise, exception is raised
+            """
+            if not self.logged_on:
+                raise IllegalAccessException("illegal access exception")
+            if self.patients_dao.search_patient(phn1) is None:
+                raise IllegalOperationException("illegal operation exception")
+            if phn1 != phn2 and self.patients_dao.search_patient(phn2) is not None:
+                raise IllegalOperationException("illegal operation exception")
+            elif self.current_patient is not None and phn1 == self.current_patient.get_phn():
+                raise IllegalOperationException("illegal operation exception")
+            cur = self.patients_dao.search_patient(phn1)
+            cur.set_phn(phn2)
+            cur.set_name(name)
+            cur.set_bday(bday)
+            cur.set_phone(phone)
+            cur.set_email(email)
+            cur.set_address(address)
+            updated = self.patients_dao.update_patient(phn1, cur)
+            if phn1 != phn2:
+                self.note_search.remove_patient(phn1)
+                if self.note_search.loaded:
+                    for note in cur.get_patient_rec().get_notes().values():
+                        self.note_search.add_note(phn2, note.get_note_num(), note.get_text())
+            return updated
+            
+        def list_patients(self)-> list[Patient]:
+            """
+            if self.logged_on, calls and returns PatientDAOJSON list_patient method.
+            otherwise, exception is raised
+            """
+            if not self.logged_on:
+                raise IllegalAccessException("illegal access exception")
+            return self.patients_dao.list_patients()
+
+        def delete_patient(self, phn: int)-> bool:
+            """
+            if self.logged_on, and given phn is a valid phn but not the self.current_patient phn, calls and returns PatientDAOJSON delete_patient method
+            otherwise, exception is raised
+            """
+            if not self.logged_on:
+                raise IllegalAccessException("illegal access exception")
+            if self.current_patient is not None and self.current_patient.get_phn() == phn or self.patients_dao.search_patient(phn) is None:
+                raise IllegalOperationException("illegal operation exception")
+            deleted = self.patients_dao.delete_patient(phn)
+            self.note_search.remove_patient(phn)
+            return deleted
+
+        def set_current_patient(self, phn: int)-> None:
+            """
+            if self.logged_on and given phn is a valid patient, sets the corresponding patient to self.current_patient
+            otherwise, exception is raised
+            """
+            if not self.logged_on:
+                raise IllegalAccessException("illegal access exception")
+            pat = self.patients_dao.search_patient(phn)
+            if pat is None:
+                raise IllegalOperationException("illegal operation exception")
+            self.current_patient = pat
+
+        def get_current_patient(self)-> Patient:
+            """
+            if self.logged_on with a valid current patient, returns self.current_patient,
+            otherwise, an exception is raised or, if there is no current patient, returns None
+            """
+            if not self.logged_on:
+                raise IllegalAccessException("illegal access exception")
+            if self.current_patient is None:
+                return None
+            return self.current_patient
+
+        def unset_current_patient(self)-> None:
+            """
+            if logged on, writes the pending changes and search index of the current patient's notes and sets self.current_patient to None.
+            otherwise, exception is raised. an error of a background write is raised here
+            """
+            if not self.logged_on:
+                raise IllegalAccessException("illegal access exception")
+            if self.writer is not None:
+                self.writer.flush()
+            if self.current_patient is not None:
+                self.current_patient.get_patient_rec().flush()
+            self.current_patient = None
+
+        def create_note(self, text: str)-> Note:
+            """
+            if self.logged_on and valid self.current_patient, calls and returns create_note function from Patient class
+            otherwise, exception is raised
+            """
+            if not self.logged_on:
+                raise IllegalAccessException("illegal access exception")
+            if self.current_patient is None:
+                raise NoCurrentPatientException("no current patient exception")
+            note = self.current_patient.create_note(text)
+            self.note_search.add_note(self.current_patient.get_phn(), note.get_note_num(), text)
+            return note
+
+        def search_note(self, code: int)-> Note:
+            """
+            if self.logged_on and valid self.current_patient, calls and returns search_note function from Patient class
+            otherwise, exception is raised
+            """
+            if not self.logged_on:
+                raise IllegalAccessException("illegal access exception")
+            if self.current_patient is None:
+                raise NoCurrentPatientException("no current patient exception")
+            return self.current_patient.search_note(code)
+
+        def retrieve_notes(self, keyword: str, whole_words: bool = False)-> list[Note]:
+            """
+            if self.logged_on and valid self.current_patient, calls and returns retrieve_notes function from Patient class.
+            notes containing keyword anywhere are returned, or with whole_words only those containing it as whole words.
+            otherwise, exception is raised
+            """
+            if not self.logged_on:
+                raise IllegalAccessException("illegal access exception")
+            if self.current_patient is None:
+                raise NoCurrentPatientException("no current patient exception")
+            return self.current_patient.retrieve_notes(keyword, whole_words)
+
+        def update_note(self, code: int, text: str)-> bool:
+            """
+            if self.logged_on and valid self.current_patient, calls and returns update_note function from Patient class
+            otherwise, exception is raised
+            """
+            if not self.logged_on:
+                raise IllegalAccessException("illegal access exception")
+            if self.current_patient is None:
+                raise NoCurrentPatientException("no current patient exception")
+            updated = self.current_patient.update_note(code, text)
+            if updated:
+                self.note_search.add_note(self.current_patient.get_phn(), code, text)
+            return updated
+
+        def delete_note(self, code: int)-> bool:
+            """
+            if self.logged_on and valid self.current_patient, calls and returns delete_note function from Patient class
+            otherwise, exception is raised
+            """
+            if not self.logged_on:
+                raise IllegalAccessException("illegal access exception")
+            if self.current_patient is None:
+                raise NoCurrentPatientException("no current patient exception")
+            deleted = self.current_patient.delete_note(code)
+            if deleted:
+                self.note_search.remove_note(self.current_patient.get_phn(), code)
+            return deleted
+
+        def list_notes(self, offset: int = 0, limit: int = None, newest_first: bool = True)-> list[Note]:
+            """
+            if self.logged_on and valid self.current_patient, calls and returns list_notes function from Patient class,
+            returning the page of at most limit notes that starts at offset, newest first unless newest_first is False.
+            otherwise, exception is raised
+            """
+            if not self.logged_on:
+                raise IllegalAccessException("illegal access exception")
+            if self.current_patient is None:
+                raise NoCurrentPatientException("no current patient exception")
+            return self.current_patient.list_notes(offset, limit, newest_first)
+                
+            
+
+            
+
+
+            
+
+
                 
\ No newline at end of file
@@ -0,0 +1,178 @@
+from collections import Counter
+from itertools import groupby, product
+import re
+
+WORD = re.compile(r'[^\W\d_]+')
+SOUNDEX_CODES = {letter: digit for letters, digit in (("bfpv", "1"), ("cgjkqsxz", "2"), ("dt", "3"), ("l", "4"), ("mn", "5"), ("r", "6"))
+                 for letter in letters}
+# a word that sounds like a word of the name, but is more than one edit away from it, ranks between one and two edits
+PHONETIC_COST = 1.5
+
+def name_words(name_key: str) -> list[str]:
+    """
+    returns the words of a normalized name, leaving out numbers
+    """
+    return WORD.findall(name_key)
+
+def soundex(word: str) -> str:
+    """
+    returns the american soundex code of word, a letter followed by three digits, so that words that sound alike
+    share a code, such as "smith" and "smyth" or "robert" and "rupert"
+    """
+    letters = [letter for letter in word if "a" <= letter <= "z"]
+    if not letters:
+        return word
+    code = letters[0].upper()
+    previous = SOUNDEX_CODES.get(letters[0], "")
+    for letter in letters[1:]:
+        digit = SOUNDEX_CODES.get(letter, "")
+        if digit and digit != previous:
+            code += digit
+            if len(code) == 4:
+                break
+        # h and w do not separate letters with the same code, vowels do
+        if letter not in "hw":
+            previous = digit
+    return code.ljust(4, "0")
+
+def edit_distance(first: str, second: str) -> int:
+    """
+    returns the levenshtein distance between two words, the number of inserted, deleted or replaced letters
+    """
+    if len(first) < len(second):
+        first, second = second, first
+    previous = list(range(len(second) + 1))
+    for i, first_letter in enumerate(first, 1):
+        current = [i]
+        for j, second_letter in enumerate(second, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (first_letter != second_letter)))
+        previous = current
+    return previous[-1]
+
+def max_distance(word: str) -> int:
+    """
+    returns how many edits a misspelling of word may have, fewer for short words where more would match anything
+    """
+    if len(word) <= 2:
+        return 0
+    return 1 if len(word) <= 5 else 2
+
+def bigrams(word: str) -> set[str]:
+    """
+    returns the substrings of length 2 of word, with its start and end marked so they count as well
+    """
+    padded = "^" + word + "$"
+    return {padded[i:i + 2] for i in range(len(padded) - 1)}
+
+class FuzzyNameIndex:
+    """
+    finds patients by misspelled names. each word of every name is indexed by its bigrams, to find the words a few
+    edits away from a query word, and by its soundex code, to find the words that sound like it.
+    a patient matches when every word of the query matches one of the words of its name
+    """
+    def __init__(self) -> None:
+        """
+        initializes an empty index
+        """
+        # word -> phns of the patients having it in their name. words stay indexed after their last patient is
+        # removed, and are skipped when they have no patients
+        self.phns = {}
+        # bigram -> words having it
+        self.grams = {}
+        # soundex code -> words having it
+        self.sounds = {}
+        # phn -> words of the name of the patient
+        self.words = {}
+
+    @classmethod
+    def build(cls, patients) -> 'FuzzyNameIndex':
+        """
+        returns an index of the names of the given patients
+        """
+        index = cls()
+        for patient in patients:
+            index.add(patient.get_phn(), patient.get_name_key())
+        return index
+
+    def add(self, phn: int, name_key: str) -> None:
+        """
+        adds the patient with the given phn and normalized name, replacing its previous name if it was already indexed
+        """
+        self.remove(phn)
+        words = name_words(name_key)
+        self.words[phn] = words
+        for word in words:
+            if word not in self.phns:
+                self.phns[word] = set()
+                for gram in bigrams(word):
+                    self.grams.setdefault(gram, []).append(word)
+                self.sounds.setdefault(soundex(word), []).append(word)
+            self.phns[word].add(phn)
+
+    def remove(self, phn: int) -> None:
+        """
+        removes the patient with the given phn
+        """
+        for word in self.words.pop(phn, ()):
+            self.phns[word].discard(phn)
+
+    def word_costs(self, word: str) -> dict[str, float]:
+        """
+        returns the words of the index matching a query word, each with the cost of the match:
+        the edit distance, or PHONETIC_COST for a word that only sounds alike.
+        an edit changes at most two bigrams, so only the words sharing all but two bigrams per allowed edit are compared
+        """
+        limit = max_distance(word)
+        grams = bigrams(word)
+        shared = Counter()
+        for gram in grams:
+            shared.update(self.grams.get(gram, ()))
+        needed = len(grams) - 2 * limit
+        costs = {}
+        for found, count in shared.items():
+            if count >= needed and abs(len(found) - len(word)) <= limit and self.phns[found]:
+                distance = edit_distance(word, found)
+                if distance <= limit:
+                    costs[found] = float(distance)
+        for found in self.sounds.get(soundex(word), ()):
+            if self.phns[found] and found not in costs:
+                costs[found] = PHONETIC_COST
+        return costs
+
+    def search(self, name_key: str, max_results: int) -> list[tuple[int, float]]:
+        """
+        returns the (phn, cost) of at most max_results patients whose name matches every word of the normalized
+        name name_key, lowest total cost first and by phn among equal costs. the patients are grouped by the cost
+        at which their name matches each query word, and the groups are intersected cheapest combination first,
+        so a common name does not score every patient having it
+        """
+        query = list(dict.fromkeys(name_words(name_key)))
+        if not query or max_results <= 0:
+            return []
+        levels = []
+        for word in query:
+            by_cost = {}
+            for found, cost in self.word_costs(word).items():
+                by_cost.setdefault(cost, []).append(self.phns[found])
+            # cost -> phns whose best match for the word has that cost
+            level = {}
+            matched = set()
+            for cost in sorted(by_cost):
+                phns = set().union(*by_cost[cost]) - matched
+                if phns:
+                    level[cost] = phns
+                    matched |= phns
+            if not level:
+                return []
+            levels.append(level)
+        combinations = sorted(product(*(level.items() for level in levels)), key=lambda combination: sum(cost for cost, phns in combination))
+        found = []
+        for total, group in groupby(combinations, key=lambda combination: sum(cost for cost, phns in combination)):
+            if len(found) >= max_results:
+                break
+            tied = []
+            for combination in group:
+                sets = sorted((phns for cost, phns in combination), key=len)
+                tied.extend(sets[0].intersection(*sets[1:]))
+            found.extend((phn, total) for phn in sorted(tied))
+        return found[:max_results]
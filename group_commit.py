@@ -0,0 +1,96 @@
+import atexit
+import threading
+
+class GroupCommit:
+    """
+    batches the writes of a dao: changes are only marked as pending, and a single flush persists all of them once
+    max_batch changes are pending or max_delay seconds have passed since the first one, whichever comes first.
+    pending changes are also flushed by flush_all, which runs at interpreter exit
+    """
+    pending = set()
+    pending_lock = threading.Lock()
+
+    def __init__(self, flush_function, max_delay: float = 1.0, max_batch: int = 100, lock = None) -> None:
+        """
+        initializes a group commit that persists pending changes by calling flush_function.
+        lock is held while flushing and should also be held by the dao while it changes its data
+        """
+        self.flush_function = flush_function
+        self.max_delay = max_delay
+        self.max_batch = max_batch
+        self.lock = lock if lock is not None else threading.RLock()
+        self.changes = 0
+        self.timer = None
+        self.error = None
+
+    def mark_dirty(self) -> None:
+        """
+        records one pending change, flushing right away if the batch is full
+        and otherwise making sure a flush is scheduled within max_delay seconds
+        """
+        with self.lock:
+            self.raise_error()
+            self.changes += 1
+            with GroupCommit.pending_lock:
+                GroupCommit.pending.add(self)
+            if self.changes >= self.max_batch:
+                self.flush()
+            elif self.timer is None:
+                self.timer = threading.Timer(self.max_delay, self.flush_on_timer)
+                self.timer.daemon = True
+                self.timer.start()
+
+    def flush(self) -> None:
+        """
+        persists all pending changes with a single call to flush_function
+        """
+        with self.lock:
+            if self.timer is not None:
+                self.timer.cancel()
+                self.timer = None
+            self.raise_error()
+            if self.changes == 0:
+                return
+            changes = self.changes
+            self.changes = 0
+            with GroupCommit.pending_lock:
+                GroupCommit.pending.discard(self)
+            try:
+                self.flush_function()
+            except Exception:
+                self.changes += changes
+                with GroupCommit.pending_lock:
+                    GroupCommit.pending.add(self)
+                raise
+
+    def flush_on_timer(self) -> None:
+        """
+        flushes from the timer thread, keeping any error to be raised to the next caller of mark_dirty or flush
+        """
+        with self.lock:
+            self.timer = None
+            try:
+                self.flush()
+            except Exception as error:
+                self.error = error
+
+    def raise_error(self) -> None:
+        """
+        raises the error of a failed timer flush, if any
+        """
+        if self.error is not None:
+            error = self.error
+            self.error = None
+            raise error
+
+    @classmethod
+    def flush_all(cls) -> None:
+        """
+        flushes every group commit that has pending changes
+        """
+        with cls.pending_lock:
+            commits = list(cls.pending)
+        for commit in commits:
+            commit.flush()
+
+atexit.register(GroupCommit.flush_all)
@@ -0,0 +1,99 @@
+from clinic.search_key import search_key
+
+GRAM = 3
+
+def trigrams(text: str) -> set[str]:
+    """
+    returns the substrings of length 3 of text
+    """
+    return {text[i:i + GRAM] for i in range(len(text) - GRAM + 1)}
+
+class NameTrigramIndex:
+    """
+    a substring index over the normalized names of patients, see search_key. every substring of length 3 of a name maps to the phns
+    of the patients whose name contains it, so a search only checks the patients having every trigram of the query
+    """
+    def __init__(self) -> None:
+        """
+        initializes an empty index
+        """
+        # trigram -> phns of the patients whose name contains it
+        self.grams = {}
+        # phn -> normalized name, in the order the patients were added
+        self.names = {}
+        # phn -> position of the patient in the directory, so results keep the order of a linear scan
+        self.order = {}
+        self.counter = 0
+
+    @classmethod
+    def build(cls, patients) -> 'NameTrigramIndex':
+        """
+        returns an index of the names of the given patients
+        """
+        index = cls()
+        for patient in patients:
+            index.add(patient.get_phn(), patient.get_name_key())
+        return index
+
+    def add(self, phn: int, name_key: str) -> None:
+        """
+        adds the patient with the given phn and normalized name, replacing its previous name if it was already indexed
+        """
+        if phn in self.names:
+            self.remove_grams(phn)
+        else:
+            self.counter += 1
+            self.order[phn] = self.counter
+        self.names[phn] = name_key
+        for gram in trigrams(name_key):
+            self.grams.setdefault(gram, set()).add(phn)
+
+    def remove(self, phn: int) -> None:
+        """
+        removes the patient with the given phn
+        """
+        if phn in self.names:
+            self.remove_grams(phn)
+            del self.names[phn]
+            del self.order[phn]
+
+    def remove_grams(self, phn: int) -> None:
+        """
+        removes the phn from the trigrams of its indexed name
+        """
+        for gram in trigrams(self.names[phn]):
+            phns = self.grams[gram]
+            phns.discard(phn)
+            if not phns:
+                del self.grams[gram]
+
+    def search(self, search_string: str) -> list[int]:
+        """
+        returns the phns of the patients whose name contains search_string, ignoring case and accents, in directory order
+        """
+        found = list(self.matching(search_string))
+        found.sort(key=self.order.get)
+        return found
+
+    def matching(self, search_string: str) -> set[int]:
+        """
+        returns the set of phns of the patients whose name contains search_string, ignoring case and accents.
+        a search string shorter than a trigram has no trigrams to look up, so every name is checked
+        """
+        folded = search_key(search_string)
+        grams = trigrams(folded)
+        if not grams:
+            return {phn for phn, name in self.names.items() if folded in name}
+        candidates = sorted((self.grams.get(gram, set()) for gram in grams), key=len)
+        phns = candidates[0].intersection(*candidates[1:])
+        return {phn for phn in phns if folded in self.names[phn]}
+
+    def estimate(self, search_string: str) -> int:
+        """
+        returns an upper bound of the number of patients whose name contains search_string, the number having its rarest
+        trigram, or None if it is shorter than a trigram and every name would be checked
+        """
+        grams = trigrams(search_key(search_string))
+        if not grams:
+            return None
+        return min(len(self.grams.get(gram, ())) for gram in grams)
@@ -1,69 +1,117 @@
-import datetime
-class Note:
-    def __init__(self, code: int = 0, text: str = "")-> None:
-        """
-        initializes attributes of Note instance
-        """
-        self.text = text
-        self.code = code
-        self.timestamp = datetime.datetime.now()
-
-    def __eq__(self, other: 'Note')-> bool:
-        """
-        returns True if self Note has the same text and note_num as other Note,
-        otherwise returns False
-        """
-        return(self.text == other.get_text()
-                and self.code == other.get_note_num())
-    
-    def __str__(self) -> str:
-        """
-        returns a readable string with note_num and text of self Note
-        """
-        return f'Note {self.code}: {self.text}'
-
-    def get_text(self)-> str:
-        """
-        returns text of self Note instance
-        """
-        return self.text
-
-    def set_text(self, new: str)-> None:
-        """
-        sets current text of self Note to given string
-        """
-        self.text = new
-    
-    def get_note_num(self)-> int:
-        """
-        returns note_num of self Note instance
-        """
-        return self.code
-
-    def set_note_num(self, num: int)-> None:
-        """
-        sets current note_num of self Note to given value
-        """
-        self.code = num
-
-    def get_time(self)-> datetime:
-        """
-        returns time of self Note instance
-        """
-        return self.timestamp
-
-    def set_time(self)-> None:
-        """
-        sets original time of self Note to current time
-        """
-        self.timestamp = datetime.datetime.now()
-
-    def update(self, new_text: str)-> None:
-        """
-        sets the original time of self Note to current time,
-        sets the original text to given string
-        """
-        self.timestamp = datetime.datetime.now()
-        self.text = new_text
-        
-        
\ No newline at end of file
+from .search_key import search_key
+import datetime
+import time
+class Note:
+    # no per-instance __dict__, and the time is kept as an integer instead of a datetime object
+    __slots__ = ('code', 'text', 'epoch_micros', 'search_key')
+
+    def __init__(self, code: int = 0, text: str = "")-> None:
+        """
+        initializes attributes of Note instance.
+        the time of the note is stored as microseconds since the epoch in epoch_micros,
+        and the normalized text that keyword searches compare in search_key
+        """
+        self.text = text
+        self.search_key = search_key(text)
+        self.code = code
+        self.epoch_micros = time.time_ns() // 1000
+
+    @property
+    def timestamp(self)-> datetime.datetime:
+        """
+        returns the time of self Note as a local datetime
+        """
+        return datetime.datetime.fromtimestamp(self.epoch_micros // 1000000).replace(microsecond=self.epoch_micros % 1000000)
+
+    @timestamp.setter
+    def timestamp(self, value: datetime.datetime)-> None:
+        """
+        sets the time of self Note from a local datetime
+        """
+        self.epoch_micros = int(value.replace(microsecond=0).timestamp()) * 1000000 + value.microsecond
+
+    def __getstate__(self)-> tuple:
+        """
+        returns the pickled state of self Note as a (code, text, epoch_micros) tuple.
+        search_key is not pickled, it is computed again when the note is loaded
+        """
+        return (self.code, self.text, self.epoch_micros)
+
+    def __setstate__(self, state)-> None:
+        """
+        restores self Note from a (code, text, epoch_micros) tuple, or from the attribute dictionary
+        of a note pickled before Note had slots, whose timestamp is a datetime
+        """
+        if isinstance(state, dict):
+            self.code = state["code"]
+            self.text = state["text"]
+            self.timestamp = state["timestamp"]
+        else:
+            self.code, self.text, self.epoch_micros = state
+        self.search_key = search_key(self.text)
+
+    def __eq__(self, other: 'Note')-> bool:
+        """
+        returns True if self Note has the same text and note_num as other Note,
+        otherwise returns False
+        """
+        return(self.text == other.get_text()
+                and self.code == other.get_note_num())
+
+    def __str__(self) -> str:
+        """
+        returns a readable string with note_num and text of self Note
+        """
+        return f'Note {self.code}: {self.text}'
+
+    def get_text(self)-> str:
+        """
+        returns text of self Note instance
+        """
+        return self.text
+
+    def set_text(self, new: str)-> None:
+        """
+        sets current text of self Note to given string
+        """
+        self.text = new
+        self.search_key = search_key(new)
+
+    def get_search_key(self)-> str:
+        """
+        returns the normalized text of self Note that keyword searches compare
+        """
+        return self.search_key
+
+    def get_note_num(self)-> int:
+        """
+        returns note_num of self Note instance
+        """
+        return self.code
+
+    def set_note_num(self, num: int)-> None:
+        """
+        sets current note_num of self Note to given value
+        """
+        self.code = num
+
+    def get_time(self)-> datetime:
+        """
+        returns time of self Note instance
+        """
+        return self.timestamp
+
+    def set_time(self)-> None:
+        """
+        sets original time of self Note to current time
+        """
+        self.epoch_micros = time.time_ns() // 1000
+
+    def update(self, new_text: str)-> None:
+        """
+        sets the original time of self Note to current time,
+        sets the original text to given string
+        """
+        self.epoch_micros = time.time_ns() // 1000
+        self.text = new_text
+        self.search_key = search_key(new_text)
@@ -0,0 +1,100 @@
+from collections import Counter
+import lzma
+import re
+import struct
+import zlib
+
+# compressed payloads start with one of these tags. payloads are always pickles of protocol 2 or later,
+# which start with the byte 0x80, so a payload without a tag is an uncompressed pickle
+ZLIB = 1
+ZLIB_DICTIONARY = 2
+LZMA = 3
+METHODS = ("none", "zlib", "lzma")
+DICTIONARY_ID = struct.Struct('<I')
+PHRASE_WORDS = 4
+
+class NoteCompressor:
+    """
+    compresses the pickled note payloads of a note dao. payloads shorter than threshold bytes are stored as they are,
+    since compressing them saves little and costs a call to the compressor on every read.
+    a preset dictionary, trained on existing notes with train_dictionary, lets zlib compress even short payloads well
+    """
+    def __init__(self, method: str = "none", threshold: int = 256, level: int = 6, dictionary: bytes = None) -> None:
+        """
+        initializes a compressor using method, one of "none", "zlib" or "lzma", at the given level.
+        dictionary is a zlib preset dictionary and is only used by the zlib method.
+        payloads compressed by any method can be decompressed, as long as the dictionary they used is given
+        """
+        if method not in METHODS:
+            raise ValueError("unknown compression method %r, expected one of %s" % (method, ", ".join(METHODS)))
+        self.method = method
+        self.threshold = threshold
+        self.level = level
+        self.dictionary = dictionary
+        if dictionary is not None:
+            self.dictionary_id = zlib.crc32(dictionary)
+
+    def compress(self, payload: bytes) -> bytes:
+        """
+        returns payload compressed with a leading tag, or payload itself if it is below the threshold
+        or compression would not make it smaller
+        """
+        if self.method == "none" or len(payload) < self.threshold:
+            return payload
+        if self.method == "lzma":
+            compressed = bytes([LZMA]) + lzma.compress(payload, preset=self.level)
+        elif self.dictionary is not None:
+            compressor = zlib.compressobj(self.level, zdict=self.dictionary)
+            compressed = (bytes([ZLIB_DICTIONARY]) + DICTIONARY_ID.pack(self.dictionary_id)
+                          + compressor.compress(payload) + compressor.flush())
+        else:
+            compressed = bytes([ZLIB]) + zlib.compress(payload, self.level)
+        if len(compressed) >= len(payload):
+            return payload
+        return compressed
+
+    def decompress(self, data: bytes) -> bytes:
+        """
+        returns the payload stored in data by compress.
+        raises ValueError if data was compressed with a preset dictionary other than the one of this compressor
+        """
+        if len(data) == 0 or data[0] not in (ZLIB, ZLIB_DICTIONARY, LZMA):
+            return data
+        if data[0] == ZLIB:
+            return zlib.decompress(memoryview(data)[1:])
+        if data[0] == LZMA:
+            return lzma.decompress(memoryview(data)[1:])
+        dictionary_id = DICTIONARY_ID.unpack_from(data, 1)[0]
+        if self.dictionary is None or dictionary_id != self.dictionary_id:
+            raise ValueError("note payload was compressed with an unknown preset dictionary %08x" % dictionary_id)
+        decompressor = zlib.decompressobj(zdict=self.dictionary)
+        return decompressor.decompress(memoryview(data)[1 + DICTIONARY_ID.size:]) + decompressor.flush()
+
+def train_dictionary(samples, size: int = 32 * 1024) -> bytes:
+    """
+    returns a zlib preset dictionary of at most size bytes built from the phrases that occur in the most samples.
+    samples are payloads as they would be compressed, such as the pickled notes of existing patients.
+    the most common phrases are placed at the end of the dictionary, where zlib can refer to them most cheaply
+    """
+    counts = Counter()
+    for sample in samples:
+        words = re.split(rb'(?<= )', sample)
+        counts.update(set(b''.join(words[i:i + PHRASE_WORDS]) for i in range(0, len(words), 2)))
+    phrases = []
+    length = 0
+    for phrase, count in sorted(counts.items(), key=lambda item: item[1] * len(item[0]), reverse=True):
+        if count < 2:
+            break
+        if length + len(phrase) > size:
+            continue
+        phrases.append(phrase)
+        length += len(phrase)
+    phrases.reverse()
+    return b''.join(phrases)
+
+def read_dictionary(path: str) -> bytes:
+    """
+    returns the preset dictionary stored at path
+    """
+    with open(path, 'rb') as file:
+        return file.read()
@@ -0,0 +1,135 @@
+from clinic.note import Note
+from .note_dao_pickle import NoteDAOPickle
+from .background_writer import BackgroundWriter
+from .note_compressor import NoteCompressor
+from .search_cache import SearchCache
+from .atomic_write import atomic_write, sync_file
+import os
+import pickle
+import struct
+import zlib
+
+# file layout, all integers little endian:
+#   header  magic and format version
+#   frames  one per note operation: operation, payload length and crc32 of the payload, then the payload.
+#           a put frame holds the pickled (code, text, epoch_micros) of a note, compressed by the compressor of the dao,
+#           a delete frame holds its code
+MAGIC = b'CLNJ'
+VERSION = 1
+HEADER = struct.Struct('<4sI')
+FRAME = struct.Struct('<BII')
+CODE = struct.Struct('<q')
+PUT = 1
+DELETE = 2
+
+class NoteDAOJournal(NoteDAOPickle):
+    def __init__(self, autosave: bool, phn: int, group_commit: bool = False, max_delay: float = 1.0, max_batch: int = 100,
+                 durability: str = "fsync", writer: BackgroundWriter = None, compressor: NoteCompressor = None, dead_ratio: float = 0.5,
+                 compact_min: int = 64, search_cache: SearchCache = None) -> None:
+        """
+        initializes a note dao that keeps the notes of patient phn in an append-only journal, clinic/records/<phn>.jnl.
+        each created, updated or deleted note appends one frame, and opening the dao replays the journal.
+        the journal is rewritten with only the live notes once it holds at least compact_min frames
+        and more than dead_ratio of them are superseded. an existing .dat record file is migrated into the journal
+        """
+        super().__init__(autosave, phn, group_commit, max_delay, max_batch, durability, writer, compressor, search_cache)
+        self.dead_ratio = dead_ratio
+        self.compact_min = compact_min
+        self.frames = 0
+        if self.autosave:
+            self.journal_file = "clinic/records/%s.jnl" % str(phn)
+            if os.path.exists(self.journal_file):
+                self.replay_journal()
+            elif os.path.exists(self.record_file):
+                self.compact_journal()
+                os.remove(self.record_file)
+
+    def replay_journal(self)-> None:
+        """
+        rebuilds notes from the journal file. a torn or corrupt tail, left by a crash during an append, is cut off,
+        and a journal shorter than its header, left by a crash before the header was written, is started over empty
+        """
+        with open(self.journal_file, 'rb') as file:
+            data = file.read()
+        if len(data) < HEADER.size:
+            data = HEADER.pack(MAGIC, VERSION)
+            with atomic_write(self.journal_file, 'wb', self.durability) as file:
+                file.write(data)
+        if HEADER.unpack_from(data, 0) != (MAGIC, VERSION):
+            raise ValueError("%s is not a note journal" % self.journal_file)
+        self.notes = {}
+        self.frames = 0
+        offset = HEADER.size
+        while offset + FRAME.size <= len(data):
+            op, length, crc = FRAME.unpack_from(data, offset)
+            start = offset + FRAME.size
+            payload = data[start:start + length]
+            if len(payload) < length or zlib.crc32(payload) != crc:
+                break
+            if op == PUT:
+                code, text, timestamp = pickle.loads(self.compressor.decompress(payload))
+                note = Note(code, text)
+                # journals written before notes kept their time in epoch_micros hold a datetime
+                if isinstance(timestamp, int):
+                    note.epoch_micros = timestamp
+                else:
+                    note.timestamp = timestamp
+                self.notes[code] = note
+            elif op == DELETE:
+                self.notes.pop(CODE.unpack(payload)[0], None)
+            self.frames += 1
+            offset = start + length
+        if offset < len(data):
+            with open(self.journal_file, 'r+b') as file:
+                file.truncate(offset)
+        if len(self.notes) == 0:
+            self.autocounter = 0
+        else:
+            self.autocounter = max(self.notes.keys())
+
+    def frame(self, op: int, payload: bytes)-> bytes:
+        """
+        returns a journal frame for the given operation and payload
+        """
+        return FRAME.pack(op, len(payload), zlib.crc32(payload)) + payload
+
+    def put_frame(self, note: Note)-> bytes:
+        """
+        returns the frame that stores the current state of the given note
+        """
+        payload = pickle.dumps((note.get_note_num(), note.get_text(), note.epoch_micros), pickle.HIGHEST_PROTOCOL)
+        return self.frame(PUT, self.compressor.compress(payload))
+
+    def save_notes(self)-> None:
+        """
+        appends one frame for each note changed since the last save, then compacts the journal if too much of it is dead
+        """
+        with self.lock:
+            frames = []
+            for code in self.dirty_codes:
+                if code in self.notes:
+                    frames.append(self.put_frame(self.notes[code]))
+                else:
+                    frames.append(self.frame(DELETE, CODE.pack(code)))
+            if frames:
+                new_file = not os.path.exists(self.journal_file)
+                with open(self.journal_file, 'ab') as file:
+                    if new_file:
+                        file.write(HEADER.pack(MAGIC, VERSION))
+                    file.write(b''.join(frames))
+                    sync_file(file, self.durability)
+                self.frames += len(frames)
+            self.dirty_codes = {}
+            if self.frames >= self.compact_min and self.frames - len(self.notes) > self.dead_ratio * self.frames:
+                self.compact_journal()
+
+    def compact_journal(self)-> None:
+        """
+        rewrites the journal with a single put frame for each live note
+        """
+        with self.lock:
+            with atomic_write(self.journal_file, 'wb', self.durability) as file:
+                file.write(HEADER.pack(MAGIC, VERSION))
+                file.write(b''.join(self.put_frame(note) for note in self.notes.values()))
+            self.frames = len(self.notes)
+            self.dirty_codes = {}
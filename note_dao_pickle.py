@@ -1,133 +1,265 @@
-from clinic.note import Note
-from .note_dao import NoteDAO
-from pickle import dump, load
-
-class NoteDAOPickle(NoteDAO):
-    def __init__(self, autosave: bool, phn: int) -> None:
-        """
-        initializes attributes of NoteDaoPickle based on whether autosave is true or false. if true, record containing notes is loaded from a binary file field. otherwise, record is initialized as an empty dictionary 
-        """
-        self.autosave = autosave
-        if self.autosave:
-            self.record_file = "clinic/records/%s.dat" % str(phn)
-            try: 
-                with open(self.record_file, 'rb') as file:
-                    self.notes = load(file)
-                    keys = list(self.notes.keys())
-                    if len(keys) == 0:
-                        self.autocounter = 0
-                    else:
-                        self.autocounter = max(keys)
-            except FileNotFoundError:
-                self.notes = {}
-                self.autocounter = 0 
-        else:
-            self.notes = {}
-            self.autocounter = 0 
-
-
-    def get_autocounter(self)-> int:
-        """
-        returns autocounter of self PatientRecord instance
-        """
-        return self.autocounter
-
-    def set_autocounter(self, val: int)-> None:
-        """
-        sets current autocounter of self PatientRecord to given value
-        """
-        self.autocounter = val
-
-    def get_notes(self)-> dict[int, Note]:
-        """
-        returns notes of self PatientRecord instance
-        """
-        return self.notes
-
-    def set_notes(self, new_notes: dict[int, str])-> None:
-        """
-        sets current notes of self PatientRecord to given notes
-        """
-        self.notes = new_notes
-        self.autocounter = len(new_notes)  
-
-    def create_note(self, text: str)-> Note:
-        """
-        increases the autocounter by 1, creates and returns a new Note instance,
-        and adds the new Note to notes. 
-        notes is updated in patient record file
-        """
-        self.autocounter += 1
-        new_note = Note(self.autocounter, text)
-        self.notes[self.autocounter] = new_note
-        if self.autosave:
-            with open(self.record_file, 'wb') as file:
-                dump(self.notes, file)
-        return new_note
-
-    def search_note(self, key: int)-> Note:
-        """
-        if given code is in notes, returns corresponding note,
-        otherwise returns None
-        """
-        if key not in self.get_notes():
-            return None
-        else:
-            return self.notes.get(key)
-
-    def retrieve_notes(self, search_string: str)-> list[Note]:
-        """
-        returns a list of notes that contain given keyword
-        """
-        note_list = []
-        for key in self.notes:
-                if search_string.upper() in self.notes.get(key).get_text().upper():
-                    note_list.append(self.notes.get(key))
-        return note_list
-
-    def update_note(self, key: int, text: str)-> bool:
-        """
-        if the note is valid, updates the desired note and returns True.
-        notes is updated in patient record file
-        """
-        if len(self.notes) == 0 or key not in self.notes:
-            return False
-        else:
-            self.notes.get(key).update(text)
-            if self.autosave:
-                with open(self.record_file, 'wb') as file: 
-                    dump(self.notes, file)
-            return True
-
-    def delete_note(self, key: int)-> bool:
-        """
-        if the note exists, deletes from dictionary and returns True,
-        notes is updated in patient record file
-        """
-        if len(self.notes) == 0 or key not in self.notes:
-            return False
-        else:
-            del self.notes[key]
-            keys = list(self.notes.keys())
-            if len(self.notes) != 0:
-                self.autocounter = max(keys)
-            else:
-                self.autocounter = 0
-            if self.autosave:
-                with open(self.record_file, 'wb') as file:
-                    dump(self.notes, file)
-            return True
-
-    def list_notes(self)-> list[Note]:
-        """
-        returns a list of the notes in reverse order of when they were created
-        """
-        note_list = []
-        if(len(self.notes) == 0):
-            return note_list
-        else:
-            note_list = list(self.notes.values())
-            note_list.reverse()
-            return note_list
-
-    
+from clinic.note import Note
+from .note_dao import NoteDAO
+from .group_commit import GroupCommit
+from .background_writer import BackgroundWriter
+from .note_compressor import NoteCompressor
+from .note_index import NoteIndex
+from .search_cache import SearchCache
+from clinic.search_key import search_key
+from .atomic_write import atomic_write, check_durability
+from pickle import dumps, loads
+from functools import partial
+from itertools import islice
+import threading
+
+class NoteDAOPickle(NoteDAO):
+    def __init__(self, autosave: bool, phn: int, group_commit: bool = False, max_delay: float = 1.0, max_batch: int = 100, durability: str = "fsync",
+                 writer: BackgroundWriter = None, compressor: NoteCompressor = None, search_cache: SearchCache = None) -> None:
+        """
+        initializes attributes of NoteDaoPickle based on whether autosave is true or false. if true, record containing notes is loaded from a binary file field. otherwise, record is initialized as an empty dictionary.
+        if group_commit is True, changes to the notes are written together once max_batch of them are pending or max_delay seconds after the first one.
+        durability is one of "none", "flush", "fsync" or "fsync+dirsync" and sets how safely the record file is written.
+        if a writer is given, the record file is written on its background thread instead, and group_commit is not used.
+        compressor compresses the pickled notes before they are written, by default they are written uncompressed.
+        keyword searches use an inverted index of the notes, built on the first search and kept up to date by every change.
+        it is saved to clinic/records/<phn>.idx by flush, and reused as long as it matches the notes.
+        keyword search results are kept in search_cache, which may be shared by the note daos of all patients, under the phn
+        """
+        check_durability(durability)
+        self.autosave = autosave
+        self.phn = phn
+        self.durability = durability
+        self.lock = threading.RLock()
+        # codes of the notes created, updated or deleted since the last save, as the keys of a dict so they stay in the
+        # order they first changed in and a journal replays the notes in the order they were created
+        self.dirty_codes = {}
+        self.writer = writer
+        if compressor is None:
+            compressor = NoteCompressor()
+        self.compressor = compressor
+        if search_cache is None:
+            search_cache = SearchCache()
+        self.search_cache = search_cache
+        # results cached for this phn by an earlier dao may be of notes that have since changed on disk
+        self.search_cache.invalidate(self.phn)
+        self.index = None
+        self.index_file = None
+        if group_commit and writer is None:
+            self.group_commit = GroupCommit(self.save_notes, max_delay, max_batch, self.lock)
+        else:
+            self.group_commit = None
+        if self.autosave:
+            self.record_file = "clinic/records/%s.dat" % str(phn)
+            self.index_file = "clinic/records/%s.idx" % str(phn)
+            try: 
+                with open(self.record_file, 'rb') as file:
+                    self.notes = loads(self.compressor.decompress(file.read()))
+                    keys = list(self.notes.keys())
+                    if len(keys) == 0:
+                        self.autocounter = 0
+                    else:
+                        self.autocounter = max(keys)
+            except FileNotFoundError:
+                self.notes = {}
+                self.autocounter = 0 
+        else:
+            self.notes = {}
+            self.autocounter = 0 
+
+
+    def get_autocounter(self)-> int:
+        """
+        returns autocounter of self PatientRecord instance
+        """
+        return self.autocounter
+
+    def set_autocounter(self, val: int)-> None:
+        """
+        sets current autocounter of self PatientRecord to given value
+        """
+        self.autocounter = val
+
+    def get_notes(self)-> dict[int, Note]:
+        """
+        returns notes of self PatientRecord instance
+        """
+        return self.notes
+
+    def set_notes(self, new_notes: dict[int, str])-> None:
+        """
+        sets current notes of self PatientRecord to given notes
+        """
+        self.notes = new_notes
+        self.autocounter = len(new_notes)
+        self.index = None
+        self.search_cache.invalidate(self.phn)
+
+    def save_notes(self)-> None:
+        """
+        writes notes to the patient record file
+        """
+        with self.lock:
+            with atomic_write(self.record_file, 'wb', self.durability) as file:
+                file.write(self.compressor.compress(dumps(self.notes)))
+            self.dirty_codes = {}
+
+    def save_changes(self, key: int)-> bool:
+        """
+        records that the note with the given code changed, then writes notes to the patient record file if autosave is on,
+        or marks the write as pending with group commit. returns True if the write is left to the background writer,
+        which the caller queues with submit_changes once it has released the lock
+        """
+        if not self.autosave:
+            return False
+        self.dirty_codes[key] = None
+        if self.writer is not None:
+            return True
+        if self.group_commit is not None:
+            self.group_commit.mark_dirty()
+        else:
+            self.save_notes()
+        return False
+
+    def submit_changes(self)-> None:
+        """
+        queues the write of notes to the patient record file on the background writer. it must not be called with the
+        lock held, since submit waits while the queue is full and the writer thread takes the lock to write
+        """
+        self.writer.submit(self.record_file, self.save_notes)
+
+    def flush(self)-> None:
+        """
+        writes any changes still pending in the background writer or the group commit
+        """
+        if self.writer is not None:
+            self.writer.flush()
+        if self.group_commit is not None:
+            self.group_commit.flush()
+        with self.lock:
+            if self.index is not None and self.index.dirty and self.index_file is not None:
+                self.index.save(self.index_file, self.notes)
+
+    def note_index(self)-> NoteIndex:
+        """
+        returns the inverted index of notes, loading it from the index file or building it on first use
+        """
+        with self.lock:
+            if self.index is None and self.index_file is not None:
+                self.index = NoteIndex.load(self.index_file, self.notes)
+            if self.index is None:
+                self.index = NoteIndex.build(self.notes)
+            return self.index
+
+    def create_note(self, text: str)-> Note:
+        """
+        increases the autocounter by 1, creates and returns a new Note instance,
+        and adds the new Note to notes. 
+        notes is updated in patient record file
+        """
+        with self.lock:
+            self.autocounter += 1
+            new_note = Note(self.autocounter, text)
+            self.notes[self.autocounter] = new_note
+            if self.index is not None:
+                self.index.add(self.autocounter, new_note.get_search_key())
+            self.search_cache.invalidate(self.phn)
+            submit = self.save_changes(self.autocounter)
+        if submit:
+            self.submit_changes()
+        return new_note
+
+    def search_note(self, key: int)-> Note:
+        """
+        if given code is in notes, returns corresponding note,
+        otherwise returns None
+        """
+        if key not in self.get_notes():
+            return None
+        else:
+            return self.notes.get(key)
+
+    def retrieve_notes(self, search_string: str, whole_words: bool = False)-> list[Note]:
+        """
+        returns a list of notes that contain given keyword, ignoring case and accents.
+        the inverted index narrows the search to the notes holding the words of keyword, which are then checked for it
+        as a substring. with whole_words, only notes containing the words of keyword as a phrase of whole words are returned.
+        a keyword without words is looked for as a substring in every note.
+        the results are cached until the notes change
+        """
+        return self.search_cache.lookup((search_key(search_string), whole_words), partial(self.find_notes, search_string, whole_words), self.phn)
+
+    def find_notes(self, search_string: str, whole_words: bool)-> list[Note]:
+        """
+        returns the notes that retrieve_notes returns, without looking in the search cache
+        """
+        codes = self.note_index().search(search_string, whole_words)
+        if codes is None:
+            if whole_words:
+                return []
+            codes = self.notes.keys()
+        folded = search_key(search_string)
+        note_list = []
+        for key in sorted(codes):
+            note = self.notes.get(key)
+            if note is not None and (whole_words or folded in note.get_search_key()):
+                note_list.append(note)
+        return note_list
+
+    def update_note(self, key: int, text: str)-> bool:
+        """
+        if the note is valid, updates the desired note and returns True.
+        notes is updated in patient record file
+        """
+        if len(self.notes) == 0 or key not in self.notes:
+            return False
+        else:
+            with self.lock:
+                if self.index is not None:
+                    self.index.remove(key, self.notes.get(key).get_search_key())
+                self.notes.get(key).update(text)
+                if self.index is not None:
+                    self.index.add(key, self.notes.get(key).get_search_key())
+                self.search_cache.invalidate(self.phn)
+                submit = self.save_changes(key)
+            if submit:
+                self.submit_changes()
+            return True
+
+    def delete_note(self, key: int)-> bool:
+        """
+        if the note exists, deletes from dictionary and returns True,
+        notes is updated in patient record file
+        """
+        if len(self.notes) == 0 or key not in self.notes:
+            return False
+        else:
+            with self.lock:
+                if self.index is not None:
+                    self.index.remove(key, self.notes.get(key).get_search_key())
+                del self.notes[key]
+                keys = list(self.notes.keys())
+                if len(self.notes) != 0:
+                    self.autocounter = max(keys)
+                else:
+                    self.autocounter = 0
+                self.search_cache.invalidate(self.phn)
+                submit = self.save_changes(key)
+            if submit:
+                self.submit_changes()
+            return True
+
+    def list_notes(self, offset: int = 0, limit: int = None, newest_first: bool = True)-> list[Note]:
+        """
+        returns a page of at most limit notes, all of them if limit is None, skipping the first offset,
+        in reverse order of when they were created if newest_first is True and in order of creation otherwise.
+        notes keeps the order the notes were created in, so only the notes up to the end of the page are visited
+        """
+        if newest_first:
+            notes = reversed(self.notes.values())
+        else:
+            notes = iter(self.notes.values())
+        if limit is None:
+            return list(islice(notes, offset, None))
+        return list(islice(notes, offset, offset + limit))
+
+    
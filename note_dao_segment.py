@@ -0,0 +1,40 @@
+from .note_dao_pickle import NoteDAOPickle
+from .note_segment_store import NoteSegmentStore
+from .background_writer import BackgroundWriter
+from .note_compressor import NoteCompressor
+from .search_cache import SearchCache
+from pickle import dumps, loads, HIGHEST_PROTOCOL
+import os
+
+class NoteDAOSegment(NoteDAOPickle):
+    def __init__(self, autosave: bool, phn: int, store: NoteSegmentStore = None, group_commit: bool = False, max_delay: float = 1.0,
+                 max_batch: int = 100, durability: str = "fsync", writer: BackgroundWriter = None, compressor: NoteCompressor = None,
+                 search_cache: SearchCache = None) -> None:
+        """
+        initializes a note dao that keeps the notes of patient phn as one record of a NoteSegmentStore shared by all patients,
+        instead of in its own clinic/records/<phn>.dat file. an existing .dat record file is migrated into the store
+        """
+        super().__init__(autosave, phn, group_commit, max_delay, max_batch, durability, writer, compressor, search_cache)
+        # one index file per patient is what the store avoids, so the keyword index is rebuilt on the first search
+        self.index_file = None
+        self.store = store
+        if self.autosave:
+            if self.store is None:
+                raise ValueError("a segment note dao with autosave needs a store")
+            if phn in self.store:
+                self.notes = loads(self.compressor.decompress(self.store.read(phn)))
+                if len(self.notes) == 0:
+                    self.autocounter = 0
+                else:
+                    self.autocounter = max(self.notes.keys())
+            elif os.path.exists(self.record_file):
+                self.save_notes()
+                os.remove(self.record_file)
+
+    def save_notes(self)-> None:
+        """
+        writes notes as the new record of the patient in the segment store
+        """
+        with self.lock:
+            self.store.write(self.phn, self.compressor.compress(dumps(self.notes, HIGHEST_PROTOCOL)))
+            self.dirty_codes = {}
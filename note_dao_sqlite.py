@@ -0,0 +1,197 @@
+from clinic.note import Note
+from .note_dao import NoteDAO
+from .note_index import tokenize
+from .search_cache import SearchCache
+from clinic.search_key import search_key
+from functools import partial
+import sqlite3
+
+class NoteDAOSQLite(NoteDAO):
+    def __init__(self, connection: sqlite3.Connection, phn: int, search_cache: SearchCache = None) -> None:
+        """
+        initializes a note dao over the notes table of the given sqlite connection, holding the notes of patient phn.
+        notes are not loaded into memory, every operation is a query on the (phn, code) primary key.
+        the words of the search key of each note are kept in the note_words table, an inverted index for whole word searches.
+        keyword search results are kept in search_cache under the phn
+        """
+        self.connection = connection
+        self.phn = phn
+        if search_cache is None:
+            search_cache = SearchCache()
+        self.search_cache = search_cache
+        # results cached for this phn by an earlier dao may be of notes that have since changed
+        self.search_cache.invalidate(self.phn)
+        row = self.connection.execute("SELECT MAX(code) FROM notes WHERE phn = ?", (self.phn,)).fetchone()
+        self.autocounter = row[0] or 0
+
+    @property
+    def notes(self) -> dict[int, Note]:
+        """
+        returns the notes of the patient as a dictionary, ordered by code
+        """
+        return self.get_notes()
+
+    def to_note(self, row: tuple) -> Note:
+        """
+        builds a Note instance from a (code, text, timestamp) row, ignoring any further columns
+        """
+        note = Note(row[0], row[1])
+        note.epoch_micros = row[2]
+        return note
+
+    def to_timestamp(self, note: Note) -> int:
+        """
+        returns the time of the given note as microseconds since the epoch
+        """
+        return note.epoch_micros
+
+    def flush(self)-> None:
+        """
+        does nothing, every change is committed to the database right away
+        """
+        pass
+
+    def get_autocounter(self)-> int:
+        """
+        returns autocounter of self PatientRecord instance
+        """
+        return self.autocounter
+
+    def set_autocounter(self, val: int)-> None:
+        """
+        sets current autocounter of self PatientRecord to given value
+        """
+        self.autocounter = val
+
+    def get_notes(self)-> dict[int, Note]:
+        """
+        returns notes of self PatientRecord instance
+        """
+        rows = self.connection.execute("SELECT code, text, timestamp FROM notes WHERE phn = ? ORDER BY code", (self.phn,))
+        return {row[0]: self.to_note(row) for row in rows}
+
+    def set_notes(self, new_notes: dict[int, Note])-> None:
+        """
+        sets current notes of self PatientRecord to given notes
+        """
+        with self.connection:
+            self.connection.execute("DELETE FROM notes WHERE phn = ?", (self.phn,))
+            self.connection.execute("DELETE FROM note_words WHERE phn = ?", (self.phn,))
+            self.connection.executemany("INSERT INTO notes (phn, code, text, timestamp, search_key) VALUES (?, ?, ?, ?, ?)",
+                                        [(self.phn, code, note.get_text(), self.to_timestamp(note), note.get_search_key())
+                                         for code, note in new_notes.items()])
+            for code, note in new_notes.items():
+                self.index_words(code, note.get_search_key())
+        self.autocounter = len(new_notes)
+        self.search_cache.invalidate(self.phn)
+
+    def create_note(self, text: str)-> Note:
+        """
+        increases the autocounter by 1, creates and returns a new Note instance,
+        and inserts the new Note into the notes table
+        """
+        self.autocounter += 1
+        new_note = Note(self.autocounter, text)
+        with self.connection:
+            self.connection.execute("INSERT INTO notes (phn, code, text, timestamp, search_key) VALUES (?, ?, ?, ?, ?)",
+                                    (self.phn, new_note.get_note_num(), text, self.to_timestamp(new_note), new_note.get_search_key()))
+            self.index_words(new_note.get_note_num(), new_note.get_search_key())
+        self.search_cache.invalidate(self.phn)
+        return new_note
+
+    def search_note(self, key: int)-> Note:
+        """
+        if given code is in notes, returns corresponding note,
+        otherwise returns None
+        """
+        row = self.connection.execute("SELECT code, text, timestamp FROM notes WHERE phn = ? AND code = ?", (self.phn, key)).fetchone()
+        if row is None:
+            return None
+        return self.to_note(row)
+
+    def retrieve_notes(self, search_string: str, whole_words: bool = False)-> list[Note]:
+        """
+        returns a list of notes that contain given keyword, ignoring case and accents, by comparing its search key
+        with the search_key column. with whole_words, only notes containing the words of keyword as a phrase of
+        whole words are returned. the results are cached until the notes change
+        """
+        key = search_key(search_string)
+        return self.search_cache.lookup((key, whole_words), partial(self.find_notes, key, whole_words), self.phn)
+
+    def find_notes(self, key: str, whole_words: bool)-> list[Note]:
+        """
+        returns the notes whose search key contains key, the search key of the keyword, or with whole_words its words
+        as a phrase, without looking in the search cache
+        """
+        if whole_words:
+            words = tokenize(key)
+            if not words:
+                return []
+            # the inverted index gives the notes having every word, whose search keys are then checked for the phrase
+            distinct = list(dict.fromkeys(words))
+            candidates = " INTERSECT ".join(["SELECT code FROM note_words WHERE phn = ? AND word = ?"] * len(distinct))
+            parameters = [value for word in distinct for value in (self.phn, word)]
+            rows = self.connection.execute("SELECT code, text, timestamp, search_key FROM notes WHERE phn = ? AND code IN (%s) ORDER BY code" % candidates,
+                                           [self.phn] + parameters)
+            return [self.to_note(row) for row in rows if self.contains_phrase(tokenize(row[3]), words)]
+        pattern = "%" + key.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        rows = self.connection.execute("SELECT code, text, timestamp FROM notes WHERE phn = ? AND search_key LIKE ? ESCAPE '\\' ORDER BY code",
+                                       (self.phn, pattern))
+        return [self.to_note(row) for row in rows]
+
+    def index_words(self, code: int, key: str)-> None:
+        """
+        adds the words of the search key of the note with the given code to the note_words inverted index
+        """
+        self.connection.executemany("INSERT INTO note_words (phn, word, code) VALUES (?, ?, ?)",
+                                    [(self.phn, word, code) for word in set(tokenize(key))])
+
+    def contains_phrase(self, text_words: list[str], words: list[str]) -> bool:
+        """
+        returns True if words occur in text_words at consecutive positions
+        """
+        for start in range(len(text_words) - len(words) + 1):
+            if text_words[start:start + len(words)] == words:
+                return True
+        return False
+
+    def update_note(self, key: int, text: str)-> bool:
+        """
+        if the note is valid, updates the desired note and returns True.
+        notes is updated in the notes table
+        """
+        note = Note(key, text)
+        with self.connection:
+            cursor = self.connection.execute("UPDATE notes SET text = ?, timestamp = ?, search_key = ? WHERE phn = ? AND code = ?",
+                                             (text, self.to_timestamp(note), note.get_search_key(), self.phn, key))
+            if cursor.rowcount > 0:
+                self.connection.execute("DELETE FROM note_words WHERE phn = ? AND code = ?", (self.phn, key))
+                self.index_words(key, note.get_search_key())
+        self.search_cache.invalidate(self.phn)
+        return cursor.rowcount > 0
+
+    def delete_note(self, key: int)-> bool:
+        """
+        if the note exists, deletes from the notes table and returns True
+        """
+        with self.connection:
+            cursor = self.connection.execute("DELETE FROM notes WHERE phn = ? AND code = ?", (self.phn, key))
+            self.connection.execute("DELETE FROM note_words WHERE phn = ? AND code = ?", (self.phn, key))
+        if cursor.rowcount == 0:
+            return False
+        self.search_cache.invalidate(self.phn)
+        row = self.connection.execute("SELECT MAX(code) FROM notes WHERE phn = ?", (self.phn,)).fetchone()
+        self.autocounter = row[0] or 0
+        return True
+
+    def list_notes(self, offset: int = 0, limit: int = None, newest_first: bool = True)-> list[Note]:
+        """
+        returns a page of at most limit notes, all of them if limit is None, skipping the first offset,
+        in reverse order of when they were created if newest_first is True and in order of creation otherwise
+        """
+        order = "DESC" if newest_first else "ASC"
+        if limit is None:
+            limit = -1
+        rows = self.connection.execute("SELECT code, text, timestamp FROM notes WHERE phn = ? ORDER BY code %s LIMIT ? OFFSET ?" % order,
+                                       (self.phn, limit, offset))
+        return [self.to_note(row) for row in rows]
@@ -0,0 +1,141 @@
+from clinic.note import Note
+from clinic.search_key import search_key
+from .atomic_write import atomic_write
+from array import array
+from pickle import dump, load, HIGHEST_PROTOCOL, UnpicklingError
+import re
+import zlib
+
+VERSION = 1
+TOKEN = re.compile(r'\w+')
+
+def tokenize(key: str) -> list[str]:
+    """
+    returns the words of a text normalized by search_key, in order
+    """
+    return TOKEN.findall(key)
+
+def fingerprint(notes: dict[int, Note]) -> int:
+    """
+    returns a checksum of the codes and times of the given notes. every change to a note changes its time,
+    so an index saved with the same fingerprint as the notes is up to date
+    """
+    values = array('q')
+    for code, note in notes.items():
+        values.append(code)
+        values.append(note.epoch_micros)
+    return zlib.crc32(values.tobytes())
+
+class NoteIndex:
+    """
+    an inverted index over the notes of one patient record, mapping each normalized word
+    to the codes of the notes that contain it and the positions of the word in each of them
+    """
+    def __init__(self) -> None:
+        """
+        initializes an empty index
+        """
+        # word -> note code -> positions of the word in the note
+        self.postings = {}
+        self.dirty = False
+
+    @classmethod
+    def build(cls, notes: dict[int, Note]) -> 'NoteIndex':
+        """
+        returns an index of the given notes
+        """
+        index = cls()
+        for code, note in notes.items():
+            index.add(code, note.get_search_key())
+        return index
+
+    @classmethod
+    def load(cls, path: str, notes: dict[int, Note]) -> 'NoteIndex':
+        """
+        returns the index saved at path if it is up to date with the given notes, otherwise returns None,
+        as it does for a missing or corrupt file
+        """
+        try:
+            with open(path, 'rb') as file:
+                version, stamp, postings = load(file)
+        except (FileNotFoundError, EOFError, ValueError, UnpicklingError):
+            return None
+        if version != VERSION or stamp != fingerprint(notes):
+            return None
+        index = cls()
+        index.postings = postings
+        return index
+
+    def save(self, path: str, notes: dict[int, Note]) -> None:
+        """
+        writes the index to path, stamped with the fingerprint of the notes it was built from.
+        the index can always be rebuilt from the notes, so it is not fsynced
+        """
+        with atomic_write(path, 'wb', "flush") as file:
+            dump((VERSION, fingerprint(notes), self.postings), file, HIGHEST_PROTOCOL)
+        self.dirty = False
+
+    def add(self, code: int, key: str) -> None:
+        """
+        adds the words of the note with the given code and normalized text
+        """
+        for position, word in enumerate(tokenize(key)):
+            self.postings.setdefault(word, {}).setdefault(code, []).append(position)
+        self.dirty = True
+
+    def remove(self, code: int, key: str) -> None:
+        """
+        removes the words of the note with the given code, whose indexed normalized text is key
+        """
+        for word in set(tokenize(key)):
+            codes = self.postings.get(word)
+            if codes is not None:
+                codes.pop(code, None)
+                if not codes:
+                    del self.postings[word]
+        self.dirty = True
+
+    def matching_positions(self, words: list[str], whole_words: bool) -> list[dict[int, set[int]]]:
+        """
+        returns, for each of the given words, the positions in each note of the indexed words it matches.
+        with whole_words a word only matches itself. otherwise the first word also matches the words ending with it,
+        the last word the words starting with it, and a single word any word containing it
+        """
+        matches = []
+        for i, word in enumerate(words):
+            if whole_words or 0 < i < len(words) - 1:
+                vocabulary = [word] if word in self.postings else []
+            elif len(words) == 1:
+                vocabulary = [indexed for indexed in self.postings if word in indexed]
+            elif i == 0:
+                vocabulary = [indexed for indexed in self.postings if indexed.endswith(word)]
+            else:
+                vocabulary = [indexed for indexed in self.postings if indexed.startswith(word)]
+            positions = {}
+            for indexed in vocabulary:
+                for code, found in self.postings[indexed].items():
+                    positions.setdefault(code, set()).update(found)
+            matches.append(positions)
+        return matches
+
+    def search(self, query: str, whole_words: bool = False) -> set[int]:
+        """
+        returns the codes of the notes whose words match the words of query at consecutive positions,
+        or None if query has no words and cannot be answered from the index.
+        with whole_words the result is exact. otherwise it is every note that could contain query as a substring,
+        which the caller still has to check
+        """
+        words = tokenize(search_key(query))
+        if not words:
+            return None
+        matches = self.matching_positions(words, whole_words)
+        codes = set(matches[0])
+        for positions in matches[1:]:
+            codes.intersection_update(positions)
+        found = set()
+        for code in codes:
+            for start in matches[0][code]:
+                if all(start + i in matches[i][code] for i in range(1, len(words))):
+                    found.add(code)
+                    break
+        return found
@@ -0,0 +1,230 @@
+from .atomic_write import check_durability, sync_file, sync_directory
+import os
+import re
+import struct
+import threading
+import zlib
+
+# each segment file starts with a header, magic and format version, followed by frames, all integers little endian.
+# a frame holds the phn of a patient, the length and crc32 of its payload, then the payload: the pickled notes of
+# the patient, or nothing for a deleted record. the last frame of a phn in the newest segment holding it wins
+MAGIC = b'CLNS'
+VERSION = 1
+HEADER = struct.Struct('<4sI')
+FRAME = struct.Struct('<qII')
+SEGMENT_NAME = re.compile(r'^segment-(\d+)\.seg$')
+
+class NoteSegmentStore:
+    """
+    packs the note records of many patients into a few large append-only segment files, instead of one file per patient.
+    an in-memory index maps each phn to the segment, offset and length of its latest record, and is rebuilt
+    by scanning the frames of the segments when the store is opened
+    """
+    def __init__(self, directory: str = "clinic/records/segments", max_segment_size: int = 64 * 1024 * 1024,
+                 dead_ratio: float = 0.5, durability: str = "fsync") -> None:
+        """
+        opens the segment files in directory, creating it if needed. a new segment is started once the current one
+        grows past max_segment_size bytes, and the older segments are compacted once more than dead_ratio of
+        their bytes belong to superseded or deleted records
+        """
+        check_durability(durability)
+        self.directory = directory
+        self.max_segment_size = max_segment_size
+        self.dead_ratio = dead_ratio
+        self.durability = durability
+        self.lock = threading.RLock()
+        # phn -> (segment number, offset of the payload, length of the payload)
+        self.index = {}
+        # segment number -> size in bytes and bytes of the records in the index
+        self.sizes = {}
+        self.live = {}
+        # open read handles, segment number -> file
+        self.readers = {}
+        self.active = None
+        self.active_number = 0
+        os.makedirs(directory, exist_ok=True)
+        self.load_segments()
+
+    def segment_path(self, number: int) -> str:
+        """
+        returns the path of the segment file with the given number
+        """
+        return os.path.join(self.directory, "segment-%06d.seg" % number)
+
+    def load_segments(self) -> None:
+        """
+        builds the index from the frames of every segment, oldest first, checking the crc32 of each payload.
+        the newest segment is cut off at its first torn or corrupt frame, left by a crash during an append,
+        so the previous record of its phn stays in the index
+        """
+        numbers = sorted(int(match.group(1)) for match in map(SEGMENT_NAME.match, os.listdir(self.directory)) if match)
+        for number in numbers:
+            path = self.segment_path(number)
+            size = os.path.getsize(path)
+            with open(path, 'rb') as file:
+                if file.read(HEADER.size) != HEADER.pack(MAGIC, VERSION):
+                    raise ValueError("%s is not a note segment" % path)
+                offset = HEADER.size
+                while offset + FRAME.size <= size:
+                    phn, length, crc = FRAME.unpack(file.read(FRAME.size))
+                    start = offset + FRAME.size
+                    payload = file.read(length)
+                    if len(payload) < length or zlib.crc32(payload) != crc:
+                        break
+                    self.index_record(phn, number, start, length)
+                    offset = start + length
+            if offset < size:
+                if number != numbers[-1]:
+                    raise ValueError("%s is truncated or corrupt" % path)
+                with open(path, 'r+b') as file:
+                    file.truncate(offset)
+            self.sizes[number] = offset
+            self.live.setdefault(number, 0)
+        if numbers:
+            self.open_active(numbers[-1])
+        else:
+            self.open_active(1)
+
+    def index_record(self, phn: int, number: int, offset: int, length: int) -> None:
+        """
+        points the index at a new record of phn, a deleted record if length is 0, and updates the live byte counts
+        """
+        old = self.index.pop(phn, None)
+        if old is not None:
+            self.live[old[0]] -= FRAME.size + old[2]
+        if length > 0:
+            self.index[phn] = (number, offset, length)
+            self.live[number] = self.live.get(number, 0) + FRAME.size + length
+
+    def open_active(self, number: int) -> None:
+        """
+        opens the segment with the given number for appending, creating it if it does not exist
+        """
+        if self.active is not None:
+            self.active.close()
+        path = self.segment_path(number)
+        new_file = not os.path.exists(path)
+        self.active = open(path, 'ab')
+        self.active_number = number
+        if new_file:
+            self.active.write(HEADER.pack(MAGIC, VERSION))
+            self.sync_active()
+            if self.durability == "fsync+dirsync":
+                sync_directory(self.directory)
+            self.sizes[number] = HEADER.size
+            self.live[number] = 0
+
+    def sync_active(self) -> None:
+        """
+        syncs the current segment. its buffer is flushed even with durability "none", since the file stays open
+        """
+        self.active.flush()
+        sync_file(self.active, self.durability)
+
+    def reader(self, number: int):
+        """
+        returns an open read handle on the segment with the given number
+        """
+        if number not in self.readers:
+            self.readers[number] = open(self.segment_path(number), 'rb')
+        return self.readers[number]
+
+    def __contains__(self, phn: int) -> bool:
+        """
+        returns True if the store holds a record for phn
+        """
+        return phn in self.index
+
+    def read(self, phn: int) -> bytes:
+        """
+        returns the latest record of phn, or None if there is none.
+        raises ValueError if the record fails its checksum
+        """
+        with self.lock:
+            if phn not in self.index:
+                return None
+            number, offset, length = self.index[phn]
+            file = self.reader(number)
+            file.seek(offset - FRAME.size)
+            frame = file.read(FRAME.size + length)
+        stored_phn, stored_length, crc = FRAME.unpack_from(frame, 0)
+        payload = frame[FRAME.size:]
+        if stored_phn != phn or stored_length != length or zlib.crc32(payload) != crc:
+            raise ValueError("note record of %d in %s failed its checksum" % (phn, self.segment_path(number)))
+        return payload
+
+    def write(self, phn: int, payload: bytes) -> None:
+        """
+        appends a new record of phn to the current segment, superseding the previous one
+        """
+        with self.lock:
+            self.append(phn, payload)
+            self.sync_active()
+            self.maintain()
+
+    def delete(self, phn: int) -> None:
+        """
+        appends a deleted record for phn, if the store holds a record for it
+        """
+        with self.lock:
+            if phn not in self.index:
+                return
+            self.append(phn, b'')
+            self.sync_active()
+            self.maintain()
+
+    def append(self, phn: int, payload: bytes) -> None:
+        """
+        writes one frame to the current segment and indexes it, without syncing
+        """
+        offset = self.sizes[self.active_number]
+        self.active.write(FRAME.pack(phn, len(payload), zlib.crc32(payload)))
+        self.active.write(payload)
+        self.sizes[self.active_number] = offset + FRAME.size + len(payload)
+        self.index_record(phn, self.active_number, offset + FRAME.size, len(payload))
+
+    def maintain(self) -> None:
+        """
+        starts a new segment if the current one is full, and compacts the older segments if too much of them is dead
+        """
+        if self.sizes[self.active_number] >= self.max_segment_size:
+            self.open_active(self.active_number + 1)
+        sealed = [number for number in self.sizes if number != self.active_number]
+        size = sum(self.sizes[number] for number in sealed)
+        dead = size - sum(self.live[number] for number in sealed)
+        if sealed and dead > self.dead_ratio * size:
+            self.compact()
+
+    def compact(self) -> None:
+        """
+        copies the live records of every older segment into the current one, then removes the older segments
+        """
+        with self.lock:
+            sealed = sorted(number for number in self.sizes if number != self.active_number)
+            for phn, (number, offset, length) in list(self.index.items()):
+                if number in sealed:
+                    self.append(phn, self.read(phn))
+            self.sync_active()
+            # oldest first, so a crash part way through never leaves an older record without the deletes that supersede it
+            for number in sealed:
+                if number in self.readers:
+                    self.readers.pop(number).close()
+                os.remove(self.segment_path(number))
+                del self.sizes[number]
+                del self.live[number]
+            if self.durability == "fsync+dirsync":
+                sync_directory(self.directory)
+            if self.sizes[self.active_number] >= self.max_segment_size:
+                self.open_active(self.active_number + 1)
+
+    def close(self) -> None:
+        """
+        closes every open segment file
+        """
+        with self.lock:
+            for file in self.readers.values():
+                file.close()
+            self.readers = {}
+            if self.active is not None:
+                self.active.close()
+                self.active = None
@@ -1,21 +1,45 @@
-from abc import ABC, abstractmethod
-class PatientDAO(ABC):
-    @abstractmethod
-    def search_patient(self, key):
-        pass
-    @abstractmethod
-    def create_patient(self, patient):
-        pass
-    @abstractmethod
-    def retrieve_patients(self, search_string):
-        pass
-    @abstractmethod
-    def update_patient(self, key, patient):
-        pass
-    @abstractmethod
-    def delete_patient(self, key):
-        pass
-    @abstractmethod
-    def list_patients(self):
-        pass
-
+from abc import ABC, abstractmethod
+class PatientDAO(ABC):
+    @abstractmethod
+    def search_patient(self, key):
+        pass
+    @abstractmethod
+    def create_patient(self, patient):
+        pass
+    @abstractmethod
+    def create_patients(self, patients):
+        pass
+    @abstractmethod
+    def retrieve_patients(self, search_string):
+        pass
+    @abstractmethod
+    def fuzzy_search_patients(self, name, max_results):
+        pass
+    @abstractmethod
+    def find_by_phone(self, phone):
+        pass
+    @abstractmethod
+    def find_by_email(self, email):
+        pass
+    @abstractmethod
+    def range_by_birth_date(self, start, end):
+        pass
+    @abstractmethod
+    def query_patients(self, predicates):
+        pass
+    @abstractmethod
+    def explain_query(self, predicates):
+        pass
+    @abstractmethod
+    def update_patient(self, key, patient):
+        pass
+    @abstractmethod
+    def delete_patient(self, key):
+        pass
+    @abstractmethod
+    def list_patients(self):
+        pass
+    @abstractmethod
+    def iter_patients(self):
+        pass
+
@@ -1,99 +1,482 @@
-from clinic.patient import Patient
-from .patient_dao import PatientDAO
-from .patient_decoder import PatientDecoder
-from .patient_encoder import PatientEncoder
-import json
-import os
-
-class PatientDAOJSON(PatientDAO):
-    def __init__(self, autosave: bool) -> None:
-        """
-        instantiates a patient directory, either as empty or loaded with patients from a json file depending on the value of autosave
-        """
-        self.autosave = autosave
-        if self.autosave:
-            self.patients = self.load_patients()
-        else:
-            self.patients = {}
-    
-    def load_patients(self) -> dict[int, Patient]:
-        """
-        returns a patient directory with patient objects that are retrieved from a file and decoded from json strings
-        """
-        patients = {}
-        try:
-            with open('clinic/patients.json', 'r') as file:
-                decoder = PatientDecoder()
-                for line in file:
-                    patient = json.loads(line.strip(), object_hook=decoder.object_hook)
-                    patients[patient.phn] = patient
-            return patients
-        except FileNotFoundError:
-             return patients
-        
-    def save_patients(self) -> None:
-        """
-        updates json file with new changes to patient directory
-        """
-        with open('clinic/patients.json', 'w') as file:
-            for patient in self.patients.values():
-                json.dump(patient, file, cls=PatientEncoder)
-                file.write('\n')
-
-    def create_patient(self, patient: Patient)-> None:
-        """
-        creates and returns a new Patient instance and adds to self.patients. updates json file
-        """
-        self.patients[patient.get_phn()] = patient
-        if self.autosave:
-            self.save_patients()
-            
-    def search_patient(self, key: int)-> Patient:
-        """
-        returns a Patient instance
-        """
-        return self.patients.get(key)
-    
-    def retrieve_patients(self, search_string: str)-> list[Patient]:
-        """
-        returns a list of patients that have the given name in their name
-        """
-        found_p = []
-        for key in self.patients:
-            if search_string.upper() in self.patients.get(key).get_name().upper():
-                found_p.append(self.patients.get(key))
-        return found_p
-        
-    def update_patient(self, key: int, patient: Patient)-> bool:
-        """
-        updates the desired patient's fields to given fields and updates patient json file. returns true
-        """
-        self.patients[patient.get_phn()] = patient
-        if key != patient.get_phn():
-            del self.patients[key]
-        if self.autosave:
-            self.save_patients()
-        return True
-        
-    def list_patients(self)-> list[Patient]:
-        """
-        returns a list of all Patients
-        """
-        patient_list = []
-        for key in self.patients:
-            patient_list.append(self.patients.get(key))
-        return patient_list
-
-    def delete_patient(self, key: int)-> bool:
-        """
-        deletes corresponding patient from self.patients and returns True. updates json file
-        """
-        del self.patients[key]
-
-        file_path = os.path.join("clinic", "records", f"{key}.dat")
-        if os.path.exists(file_path):
-            os.remove(file_path)
-
-        if self.autosave:
-            self.save_patients()
-        return True
+from clinic.patient import Patient
+from .patient_dao import PatientDAO
+from .patient_decoder import PatientDecoder
+from .patient_encoder import PatientEncoder
+from .patient_file_index import PatientFileIndex
+from .patient_snapshot import read_snapshot, write_snapshot, json_to_snapshot
+from .group_commit import GroupCommit
+from .name_index import NameTrigramIndex
+from .fuzzy_name_index import FuzzyNameIndex
+from .patient_field_index import PatientFieldIndex
+from .search_cache import SearchCache
+from .patient_query import PatientQueryPlan, parse_predicates
+from .atomic_write import atomic_write, check_durability, sync_file
+from clinic.search_key import search_key
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+import json
+import os
+import threading
+
+# files smaller than this are always loaded in a single process, since starting the workers would cost more
+PARALLEL_LOAD_MIN_SIZE = 4 * 1024 * 1024
+
+def decode_patient_lines(path: str, start: int, end: int) -> list[tuple]:
+    """
+    decodes the lines of a line-delimited patients.json file that start in the byte range [start, end)
+    and returns the fields of each patient as a tuple. runs in a worker process of a parallel load
+    """
+    fields = []
+    with open(path, 'rb') as file:
+        if start > 0:
+            # skip the line that began before start, the previous range decodes it
+            file.seek(start - 1)
+            file.readline()
+        while file.tell() < end:
+            line = file.readline()
+            if not line:
+                break
+            if line.strip():
+                dct = json.loads(line)
+                fields.append((dct["phn"], dct["name"], dct["birth_date"], dct["phone"], dct["email"], dct["address"]))
+    return fields
+
+class PatientDAOJSON(PatientDAO):
+    def __init__(self, autosave: bool, log_structured: bool = False, compact_threshold: int = 1000, note_dao_factory = None, indexed: bool = False,
+                 group_commit: bool = False, max_delay: float = 1.0, max_batch: int = 100, durability: str = "fsync",
+                 snapshot_format: str = "json", load_workers: int = 0, note_store = None, search_cache: SearchCache = None) -> None:
+        """
+        instantiates a patient directory, either as empty or loaded with patients from a json file depending on the value of autosave.
+        if log_structured is True, mutations are appended to a log file instead of rewriting the json file, and the log
+        is compacted into the json file once it holds more than compact_threshold records.
+        note_dao_factory is passed on to the records of the loaded patients.
+        if indexed is True, the json file is memory mapped and each patient is only decoded when it is accessed.
+        mutations are tracked per patient, so a save is skipped when nothing changed. in log structured mode it appends only
+        the changed fields of the changed patients, otherwise it rewrites the whole json file.
+        if group_commit is True, mutations are persisted together by a single write once max_batch of them are pending
+        or max_delay seconds after the first one.
+        durability is one of "none", "flush", "fsync" or "fsync+dirsync" and sets how safely files are written.
+        snapshot_format is "json" for the line-delimited patients.json, or "binary" for the faster patients.snap,
+        which is converted from patients.json the first time it is used.
+        if load_workers is more than 1, a large patients.json is split at line boundaries and decoded by that many processes.
+        note_store is the NoteSegmentStore holding the notes, if note_dao_factory keeps them in one.
+        name searches use a trigram index of the names and fuzzy name searches a phonetic and edit distance index,
+        and lookups by phone, email and birth date the secondary indexes of PatientFieldIndex,
+        each built on its first search and kept up to date by every change.
+        name search results are kept in search_cache until a patient is created, updated or deleted
+        """
+        check_durability(durability)
+        if snapshot_format not in ("json", "binary"):
+            raise ValueError("unknown snapshot format %r" % snapshot_format)
+        if indexed and snapshot_format != "json":
+            raise ValueError("indexed mode needs the json snapshot format")
+        self.autosave = autosave
+        self.durability = durability
+        self.note_dao_factory = note_dao_factory
+        self.note_store = note_store
+        self.log_structured = log_structured
+        self.compact_threshold = compact_threshold
+        self.indexed = indexed
+        self.snapshot_format = snapshot_format
+        self.load_workers = load_workers
+        self.patients_file = 'clinic/patients.json'
+        self.snapshot_file = 'clinic/patients.snap'
+        self.index_file = 'clinic/patients.idx'
+        self.log_file = 'clinic/patients.log'
+        self.log_entries = 0
+        self.name_index = None
+        self.fuzzy_index = None
+        self.field_index = None
+        if search_cache is None:
+            search_cache = SearchCache()
+        self.search_cache = search_cache
+        self.lock = threading.RLock()
+        # phns changed since the last save, mapped to True if the whole patient must be written and False if only its dirty fields
+        self.dirty = {}
+        # phns deleted since the last save
+        self.deleted = set()
+        if group_commit:
+            self.group_commit = GroupCommit(self.write_changes, max_delay, max_batch, self.lock)
+        else:
+            self.group_commit = None
+        if self.autosave:
+            self.patients = self.load_patients()
+            if self.log_structured and self.log_entries > self.compact_threshold:
+                self.compact_log()
+        else:
+            self.patients = {}
+    
+    def load_patients(self) -> dict[int, Patient]:
+        """
+        returns a patient directory with patient objects that are retrieved from a file and decoded from json strings.
+        in indexed mode, the patients are decoded on access instead. in log structured mode, the log is replayed on top of the json file
+        """
+        if self.indexed:
+            patients = PatientFileIndex(self.patients_file, self.index_file, self.note_dao_factory, self.durability)
+        elif self.snapshot_format == "binary":
+            if not os.path.exists(self.snapshot_file) and os.path.exists(self.patients_file):
+                json_to_snapshot(self.patients_file, self.snapshot_file, self.durability)
+            try:
+                patients = read_snapshot(self.snapshot_file, self.note_dao_factory)
+            except FileNotFoundError:
+                patients = {}
+        elif self.load_workers > 1 and os.path.exists(self.patients_file) and os.path.getsize(self.patients_file) >= PARALLEL_LOAD_MIN_SIZE:
+            patients = self.load_patients_parallel()
+        else:
+            patients = {}
+            try:
+                with open(self.patients_file, 'r') as file:
+                    decoder = PatientDecoder(note_dao_factory=self.note_dao_factory)
+                    for line in file:
+                        patient = json.loads(line.strip(), object_hook=decoder.object_hook)
+                        patients[patient.phn] = patient
+            except FileNotFoundError:
+                pass
+        if self.log_structured:
+            self.replay_log(patients)
+        return patients
+
+    def load_patients_parallel(self) -> dict[int, Patient]:
+        """
+        returns the patient directory of patients.json, decoded in byte ranges by a pool of load_workers processes.
+        the ranges are merged in file order, so the result is the same as a sequential load
+        """
+        size = os.path.getsize(self.patients_file)
+        chunks = self.load_workers * 4
+        bounds = [size * i // chunks for i in range(chunks + 1)]
+        patients = {}
+        with ProcessPoolExecutor(max_workers=self.load_workers) as executor:
+            results = executor.map(decode_patient_lines, [self.patients_file] * chunks, bounds[:-1], bounds[1:])
+            for fields in results:
+                for phn, name, bday, phone, email, address in fields:
+                    patients[phn] = Patient(phn, name, bday, phone, email, address, note_dao_factory=self.note_dao_factory)
+        return patients
+
+    def replay_log(self, patients: dict[int, Patient]) -> None:
+        """
+        applies the upsert, patch and delete records of the log file to the given patient directory, in order.
+        a partially written last record (e.g. after a crash) is cut off, so the records appended next follow the last good one
+        """
+        self.log_entries = 0
+        try:
+            with open(self.log_file, 'r+b') as file:
+                decoder = PatientDecoder(note_dao_factory=self.note_dao_factory)
+                # end of the last complete record
+                offset = 0
+                for line in file:
+                    try:
+                        if not line.endswith(b'\n'):
+                            raise ValueError("unterminated record")
+                        record = json.loads(line, object_hook=decoder.object_hook)
+                    except ValueError:
+                        file.truncate(offset)
+                        sync_file(file, self.durability)
+                        break
+                    offset += len(line)
+                    if record["op"] == "upsert":
+                        patient = record["patient"]
+                        patients[patient.phn] = patient
+                    elif record["op"] == "patch":
+                        patient = patients.get(record["phn"])
+                        if patient is not None:
+                            for field, value in record["fields"].items():
+                                setattr(patient, field, value)
+                            patient.refresh_keys()
+                    elif record["op"] == "delete":
+                        patients.pop(record["phn"], None)
+                    self.log_entries += 1
+        except FileNotFoundError:
+            pass
+
+    def append_log(self, records: list[dict]) -> None:
+        """
+        appends the given records to the log file as a delta segment, compacting the log if it has grown past the threshold
+        """
+        with open(self.log_file, 'a') as file:
+            for record in records:
+                json.dump(record, file, cls=PatientEncoder)
+                file.write('\n')
+            sync_file(file, self.durability)
+        self.log_entries += len(records)
+        if self.log_entries > self.compact_threshold:
+            self.compact_log()
+
+    def compact_log(self) -> None:
+        """
+        rewrites the json file with the current patient directory and empties the log.
+        replaying the log is idempotent, so a crash between the two steps loses nothing
+        """
+        self.save_patients()
+        with atomic_write(self.log_file, 'w', self.durability):
+            pass
+        self.log_entries = 0
+        
+    def save_patients(self) -> None:
+        """
+        updates json file with new changes to patient directory
+        """
+        if self.indexed:
+            self.patients.save()
+            return
+        if self.snapshot_format == "binary":
+            write_snapshot(self.snapshot_file, self.patients.values(), self.durability)
+            return
+        with atomic_write(self.patients_file, 'w', self.durability) as file:
+            for patient in self.patients.values():
+                json.dump(patient, file, cls=PatientEncoder)
+                file.write('\n')
+
+    def mark_changed(self, phn: int, whole: bool) -> None:
+        """
+        records that the patient with the given phn was created (whole is True) or edited through its setters
+        """
+        self.dirty[phn] = whole or self.dirty.get(phn, False)
+
+    def mark_deleted(self, phn: int) -> None:
+        """
+        records that the patient with the given phn was deleted
+        """
+        self.dirty.pop(phn, None)
+        self.deleted.add(phn)
+
+    def delta_records(self) -> list[dict]:
+        """
+        returns the log records of the changes since the last save: deletes first, then an upsert for each created
+        patient and a patch with only the dirty fields for each edited one
+        """
+        records = [{"op": "delete", "phn": phn} for phn in self.deleted]
+        for phn, whole in self.dirty.items():
+            patient = self.patients[phn]
+            if whole:
+                records.append({"op": "upsert", "patient": patient})
+            elif patient.get_dirty_fields():
+                fields = {field: getattr(patient, field) for field in sorted(patient.get_dirty_fields())}
+                records.append({"op": "patch", "phn": phn, "fields": fields})
+        return records
+
+    def save_changes(self) -> None:
+        """
+        persists the changes of the patient directory, or only marks them as pending with group commit
+        """
+        if self.group_commit is not None:
+            self.group_commit.mark_dirty()
+        else:
+            self.write_changes()
+
+    def write_changes(self) -> None:
+        """
+        persists all changes since the last save, either as one delta segment appended to the log
+        or by rewriting the json file. does nothing if nothing changed, such as when the patients marked as edited
+        have no dirty fields
+        """
+        with self.lock:
+            if self.deleted or any(whole or self.patients[phn].get_dirty_fields() for phn, whole in self.dirty.items()):
+                if self.log_structured:
+                    self.append_log(self.delta_records())
+                else:
+                    self.save_patients()
+            for phn in self.dirty:
+                self.patients[phn].clear_dirty()
+            self.dirty = {}
+            self.deleted = set()
+
+    def flush(self) -> None:
+        """
+        persists any mutations still pending in the group commit
+        """
+        if self.group_commit is not None:
+            self.group_commit.flush()
+
+    def create_patient(self, patient: Patient)-> None:
+        """
+        creates and returns a new Patient instance and adds to self.patients. updates json file
+        """
+        with self.lock:
+            self.patients[patient.get_phn()] = patient
+            self.index_patient(patient)
+            if self.autosave:
+                self.mark_changed(patient.get_phn(), True)
+                self.save_changes()
+            
+    def create_patients(self, patients: list[Patient])-> None:
+        """
+        adds all given patients to self.patients and persists them with a single write
+        """
+        with self.lock:
+            for patient in patients:
+                self.patients[patient.get_phn()] = patient
+                self.index_patient(patient)
+                if self.autosave:
+                    self.mark_changed(patient.get_phn(), True)
+            if self.autosave and patients:
+                self.save_changes()
+
+    def index_patient(self, patient: Patient) -> None:
+        """
+        adds a created or updated patient to the indexes that have been built, and invalidates the cached searches
+        """
+        self.search_cache.invalidate()
+        for index in (self.name_index, self.fuzzy_index):
+            if index is not None:
+                index.add(patient.get_phn(), patient.get_name_key())
+        if self.field_index is not None:
+            self.field_index.add(patient.get_phn(), patient.get_phone(), patient.get_email(), patient.get_bday())
+
+    def unindex_patient(self, key: int) -> None:
+        """
+        removes the patient with the given phn from the indexes that have been built, and invalidates the cached searches
+        """
+        self.search_cache.invalidate()
+        for index in (self.name_index, self.fuzzy_index, self.field_index):
+            if index is not None:
+                index.remove(key)
+
+    def search_patient(self, key: int)-> Patient:
+        """
+        returns a Patient instance
+        """
+        return self.patients.get(key)
+    
+    def retrieve_patients(self, search_string: str)-> list[Patient]:
+        """
+        returns a list of patients that have the given name in their name, ignoring case.
+        the results are cached until a patient is created, updated or deleted
+        """
+        with self.lock:
+            return self.search_cache.lookup(search_key(search_string), partial(self.find_names, search_string))
+
+    def find_names(self, search_string: str)-> list[Patient]:
+        """
+        returns the patients that retrieve_patients returns, without looking in the search cache. the lock must be held
+        """
+        if self.name_index is None:
+            self.name_index = NameTrigramIndex.build(self.iter_patients())
+        return [self.patients.get(key) for key in self.name_index.search(search_string)]
+        
+    def fuzzy_search_patients(self, name: str, max_results: int = 10)-> list[Patient]:
+        """
+        returns at most max_results patients whose name matches every word of name, allowing misspelled words
+        that are a few edits away or sound alike, best match first
+        """
+        with self.lock:
+            if self.fuzzy_index is None:
+                self.fuzzy_index = FuzzyNameIndex.build(self.iter_patients())
+            return [self.patients.get(phn) for phn, cost in self.fuzzy_index.search(search_key(name), max_results)]
+
+    def fields(self) -> PatientFieldIndex:
+        """
+        returns the index of the phones, emails and birth dates of the patients, building it on first use.
+        the lock must be held
+        """
+        if self.field_index is None:
+            self.field_index = PatientFieldIndex.build(self.iter_patients())
+        return self.field_index
+
+    def find_by_phone(self, phone: str)-> list[Patient]:
+        """
+        returns the patients with the given phone number, comparing only its digits, in phn order
+        """
+        with self.lock:
+            return [self.patients.get(phn) for phn in self.fields().find_phone(phone)]
+
+    def find_by_email(self, email: str)-> list[Patient]:
+        """
+        returns the patients with the given email address, ignoring case, in phn order
+        """
+        with self.lock:
+            return [self.patients.get(phn) for phn in self.fields().find_email(email)]
+
+    def range_by_birth_date(self, start: str, end: str)-> list[Patient]:
+        """
+        returns the patients born from start to end, both included and given as "YYYY-MM-DD", by birth date and then phn
+        """
+        with self.lock:
+            return [self.patients.get(phn) for phn in self.fields().range_birth_date(start, end)]
+
+    def plan_query(self, predicates: dict)-> PatientQueryPlan:
+        """
+        returns the plan of a query with the given predicates, see patient_query.PREDICATES, over the name index and the
+        field index, building them on first use. the lock must be held
+        """
+        if self.name_index is None:
+            self.name_index = NameTrigramIndex.build(self.iter_patients())
+        return PatientQueryPlan(parse_predicates(predicates), self.patients, self.name_index, self.fields())
+
+    def query_patients(self, predicates: dict)-> list[Patient]:
+        """
+        returns the patients satisfying every one of the given predicates, in phn order
+        """
+        with self.lock:
+            return [self.patients.get(phn) for phn in self.plan_query(predicates).execute()]
+
+    def explain_query(self, predicates: dict)-> list[str]:
+        """
+        runs a query with the given predicates and returns its plan, one line per step
+        with the estimated and actual number of patients
+        """
+        with self.lock:
+            plan = self.plan_query(predicates)
+            plan.execute()
+            return plan.explain()
+
+    def update_patient(self, key: int, patient: Patient)-> bool:
+        """
+        updates the desired patient's fields to given fields and updates patient json file. returns true.
+        nothing is written if none of the patient's fields changed
+        """
+        with self.lock:
+            if key == patient.get_phn() and not patient.get_dirty_fields():
+                return True
+            self.patients[patient.get_phn()] = patient
+            if key != patient.get_phn():
+                del self.patients[key]
+            if key != patient.get_phn():
+                self.unindex_patient(key)
+            self.index_patient(patient)
+            if self.autosave:
+                if key != patient.get_phn():
+                    self.mark_deleted(key)
+                    self.mark_changed(patient.get_phn(), True)
+                else:
+                    self.mark_changed(key, False)
+                self.save_changes()
+        return True
+        
+    def list_patients(self)-> list[Patient]:
+        """
+        returns a list of all Patients
+        """
+        patient_list = []
+        for key in self.patients:
+            patient_list.append(self.patients.get(key))
+        return patient_list
+
+    def iter_patients(self):
+        """
+        yields all Patients one at a time
+        """
+        for key in list(self.patients):
+            patient = self.patients.get(key)
+            if patient is not None:
+                yield patient
+
+    def delete_patient(self, key: int)-> bool:
+        """
+        deletes corresponding patient and its notes and returns True. updates json file
+        """
+        with self.lock:
+            self.patients[key].get_patient_rec().flush()
+            del self.patients[key]
+            self.unindex_patient(key)
+
+            for extension in ("dat", "jnl", "idx"):
+                file_path = os.path.join("clinic", "records", f"{key}.{extension}")
+                if os.path.exists(file_path):
+                    os.remove(file_path)
+            if self.note_store is not None:
+                self.note_store.delete(key)
+
+            if self.autosave:
+                self.mark_deleted(key)
+                self.save_changes()
+        return True
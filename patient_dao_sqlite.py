@@ -0,0 +1,297 @@
+from clinic.patient import Patient
+from clinic.patient_record import PatientRecord
+from .patient_dao import PatientDAO
+from .note_dao_sqlite import NoteDAOSQLite
+from .atomic_write import check_durability
+from .fuzzy_name_index import FuzzyNameIndex
+from .search_cache import SearchCache
+from .note_index import tokenize
+from .patient_query import parse_predicates
+from clinic.search_key import search_key, phone_key, email_key
+from functools import partial
+import sqlite3
+
+# the sqlite synchronous setting that gives each durability level of atomic_write
+SYNCHRONOUS = {"none": "OFF", "flush": "NORMAL", "fsync": "FULL", "fsync+dirsync": "EXTRA"}
+
+class PatientDAOSQLite(PatientDAO):
+    def __init__(self, autosave: bool, db_file: str = 'clinic/clinic.db', durability: str = "fsync", search_cache: SearchCache = None,
+                 note_search_cache: SearchCache = None) -> None:
+        """
+        instantiates a patient directory stored in a sqlite database, on disk if autosave is True and in memory otherwise.
+        the database runs in WAL mode, patients are keyed on phn and indexed on birth_date, with the normalized
+        name that name searches compare kept in name_key and the phone and email that lookups compare kept in the
+        indexed phone_key and email_key, notes are keyed on (phn, code), with the normalized text that keyword searches
+        compare kept in search_key
+        and indexed on timestamp, and the words of each search key in the note_words inverted index. the notes of each patient are accessed through a NoteDAOSQLite on the same connection.
+        durability is one of "none", "flush", "fsync" or "fsync+dirsync" and sets how commits are synced to disk.
+        fuzzy name searches use an in memory index of the names, built on the first search from the name_key column.
+        name search results are kept in search_cache and the keyword search results of the note daos in note_search_cache
+        """
+        check_durability(durability)
+        self.autosave = autosave
+        if self.autosave:
+            self.connection = sqlite3.connect(db_file, cached_statements=256)
+            self.connection.execute("PRAGMA journal_mode = WAL")
+            self.connection.execute("PRAGMA synchronous = %s" % SYNCHRONOUS[durability])
+        else:
+            self.connection = sqlite3.connect(':memory:', cached_statements=256)
+        self.create_tables()
+        self.fuzzy_index = None
+        if search_cache is None:
+            search_cache = SearchCache()
+        self.search_cache = search_cache
+        if note_search_cache is None:
+            note_search_cache = SearchCache()
+        self.note_search_cache = note_search_cache
+
+    def create_tables(self) -> None:
+        """
+        creates the patients and notes tables and their indexes if they do not exist yet
+        """
+        with self.connection:
+            self.connection.execute("""CREATE TABLE IF NOT EXISTS patients (
+                                           phn INTEGER PRIMARY KEY,
+                                           name TEXT NOT NULL,
+                                           birth_date TEXT NOT NULL,
+                                           phone TEXT NOT NULL,
+                                           email TEXT NOT NULL,
+                                           address TEXT NOT NULL,
+                                           name_key TEXT NOT NULL,
+                                           phone_key TEXT NOT NULL,
+                                           email_key TEXT NOT NULL)""")
+            columns = [row[1] for row in self.connection.execute("PRAGMA table_info(patients)")]
+            for column, source, function in (("name_key", "name", search_key), ("phone_key", "phone", phone_key), ("email_key", "email", email_key)):
+                if column not in columns:
+                    # databases created before the column get it, filled in from the field it is the key of
+                    self.connection.execute("ALTER TABLE patients ADD COLUMN %s TEXT NOT NULL DEFAULT ''" % column)
+                    self.connection.create_function(function.__name__, 1, function, deterministic=True)
+                    self.connection.execute("UPDATE patients SET %s = %s(%s)" % (column, function.__name__, source))
+            # name searches match a substring of name_key, which no index can answer, so databases that have the old
+            # index on name lose it instead of keeping it up to date on every write
+            self.connection.execute("DROP INDEX IF EXISTS patients_name")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS patients_phone ON patients (phone_key)")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS patients_email ON patients (email_key)")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS patients_birth_date ON patients (birth_date, phn)")
+            self.connection.execute("""CREATE TABLE IF NOT EXISTS notes (
+                                           phn INTEGER NOT NULL,
+                                           code INTEGER NOT NULL,
+                                           text TEXT NOT NULL,
+                                           timestamp INTEGER NOT NULL,
+                                           search_key TEXT NOT NULL,
+                                           PRIMARY KEY (phn, code))""")
+            if "search_key" not in [row[1] for row in self.connection.execute("PRAGMA table_info(notes)")]:
+                # databases created before search_key get the column, filled in from the note texts
+                self.connection.execute("ALTER TABLE notes ADD COLUMN search_key TEXT NOT NULL DEFAULT ''")
+                self.connection.create_function("search_key", 1, search_key, deterministic=True)
+                self.connection.execute("UPDATE notes SET search_key = search_key(text)")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS notes_timestamp ON notes (phn, timestamp)")
+            words_exist = self.connection.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'note_words'").fetchone()
+            self.connection.execute("""CREATE TABLE IF NOT EXISTS note_words (
+                                           phn INTEGER NOT NULL,
+                                           word TEXT NOT NULL,
+                                           code INTEGER NOT NULL,
+                                           PRIMARY KEY (phn, word, code)) WITHOUT ROWID""")
+            if not words_exist:
+                # databases created before note_words get it, filled in from the search keys of the notes
+                rows = self.connection.execute("SELECT phn, code, search_key FROM notes").fetchall()
+                self.connection.executemany("INSERT INTO note_words (phn, word, code) VALUES (?, ?, ?)",
+                                            [(phn, word, code) for phn, code, key in rows for word in set(tokenize(key))])
+
+    def note_dao_factory(self, autosave: bool, phn: int) -> NoteDAOSQLite:
+        """
+        creates the note dao of patient phn on the connection of this patient directory
+        """
+        return NoteDAOSQLite(self.connection, phn, self.note_search_cache)
+
+    def to_patient(self, row: tuple) -> Patient:
+        """
+        builds a Patient instance from a (phn, name, birth_date, phone, email, address) row
+        """
+        return Patient(row[0], row[1], row[2], row[3], row[4], row[5], self.autosave, self.note_dao_factory)
+
+    def create_patient(self, patient: Patient)-> None:
+        """
+        inserts the given patient into the patients table
+        """
+        with self.connection:
+            self.connection.execute("INSERT INTO patients (phn, name, birth_date, phone, email, address, name_key, phone_key, email_key) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                                    (patient.get_phn(), patient.get_name(), patient.get_bday(), patient.get_phone(), patient.get_email(), patient.get_address(),
+                                     patient.get_name_key(), phone_key(patient.get_phone()), email_key(patient.get_email())))
+        self.search_cache.invalidate()
+        if self.fuzzy_index is not None:
+            self.fuzzy_index.add(patient.get_phn(), patient.get_name_key())
+
+    def create_patients(self, patients: list[Patient])-> None:
+        """
+        inserts all given patients into the patients table in a single transaction
+        """
+        with self.connection:
+            self.connection.executemany("INSERT INTO patients (phn, name, birth_date, phone, email, address, name_key, phone_key, email_key) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                                        [(patient.get_phn(), patient.get_name(), patient.get_bday(), patient.get_phone(), patient.get_email(), patient.get_address(),
+                                          patient.get_name_key(), phone_key(patient.get_phone()), email_key(patient.get_email())) for patient in patients])
+        self.search_cache.invalidate()
+        if self.fuzzy_index is not None:
+            for patient in patients:
+                self.fuzzy_index.add(patient.get_phn(), patient.get_name_key())
+
+    def search_patient(self, key: int)-> Patient:
+        """
+        returns a Patient instance, or None if there is no patient with the given phn
+        """
+        row = self.connection.execute("SELECT phn, name, birth_date, phone, email, address FROM patients WHERE phn = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        return self.to_patient(row)
+
+    def retrieve_patients(self, search_string: str)-> list[Patient]:
+        """
+        returns a list of patients that have the given name in their name, ignoring case and accents.
+        the results are cached until a patient is created, updated or deleted
+        """
+        key = search_key(search_string)
+        return self.search_cache.lookup(key, partial(self.find_names, key))
+
+    def find_names(self, key: str)-> list[Patient]:
+        """
+        returns the patients whose name_key contains key, without looking in the search cache
+        """
+        pattern = "%" + key.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        rows = self.connection.execute("SELECT phn, name, birth_date, phone, email, address FROM patients WHERE name_key LIKE ? ESCAPE '\\'", (pattern,))
+        return [self.to_patient(row) for row in rows]
+
+    def fuzzy_search_patients(self, name: str, max_results: int = 10)-> list[Patient]:
+        """
+        returns at most max_results patients whose name matches every word of name, allowing misspelled words
+        that are a few edits away or sound alike, best match first
+        """
+        if self.fuzzy_index is None:
+            self.fuzzy_index = FuzzyNameIndex()
+            for phn, name_key in self.connection.execute("SELECT phn, name_key FROM patients"):
+                self.fuzzy_index.add(phn, name_key)
+        return [self.search_patient(phn) for phn, cost in self.fuzzy_index.search(search_key(name), max_results)]
+
+    def find_by_phone(self, phone: str)-> list[Patient]:
+        """
+        returns the patients with the given phone number, comparing only its digits, in phn order
+        """
+        key = phone_key(phone)
+        if not key:
+            return []
+        rows = self.connection.execute("SELECT phn, name, birth_date, phone, email, address FROM patients WHERE phone_key = ? ORDER BY phn", (key,))
+        return [self.to_patient(row) for row in rows]
+
+    def find_by_email(self, email: str)-> list[Patient]:
+        """
+        returns the patients with the given email address, ignoring case, in phn order
+        """
+        key = email_key(email)
+        if not key:
+            return []
+        rows = self.connection.execute("SELECT phn, name, birth_date, phone, email, address FROM patients WHERE email_key = ? ORDER BY phn", (key,))
+        return [self.to_patient(row) for row in rows]
+
+    def range_by_birth_date(self, start: str, end: str)-> list[Patient]:
+        """
+        returns the patients born from start to end, both included and given as "YYYY-MM-DD", by birth date and then phn
+        """
+        rows = self.connection.execute("SELECT phn, name, birth_date, phone, email, address FROM patients WHERE birth_date BETWEEN ? AND ? "
+                                       "ORDER BY birth_date, phn", (start, end))
+        return [self.to_patient(row) for row in rows]
+
+    def query_sql(self, predicates: dict) -> tuple[str, list]:
+        """
+        returns the select statement of a query with the given predicates, see patient_query.PREDICATES, and its parameters.
+        sqlite's query planner picks the index to use
+        """
+        conditions = []
+        parameters = []
+        for name, value in parse_predicates(predicates).items():
+            if name == "name":
+                conditions.append("name_key LIKE ? ESCAPE '\\'")
+                parameters.append("%" + value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%")
+            elif name == "phone":
+                conditions.append("phone_key = ? AND phone_key != ''")
+                parameters.append(value)
+            elif name == "phone_ends_with":
+                if value:
+                    conditions.append("substr(phone_key, -?) = ?")
+                    parameters.extend([len(value), value])
+            elif name == "email":
+                conditions.append("email_key = ? AND email_key != ''")
+                parameters.append(value)
+            else:
+                conditions.append("birth_date BETWEEN ? AND ?")
+                parameters.extend(value)
+        sql = "SELECT phn, name, birth_date, phone, email, address FROM patients"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        return sql + " ORDER BY phn", parameters
+
+    def query_patients(self, predicates: dict)-> list[Patient]:
+        """
+        returns the patients satisfying every one of the given predicates, in phn order
+        """
+        sql, parameters = self.query_sql(predicates)
+        return [self.to_patient(row) for row in self.connection.execute(sql, parameters)]
+
+    def explain_query(self, predicates: dict)-> list[str]:
+        """
+        returns sqlite's plan of a query with the given predicates, one line per step
+        """
+        sql, parameters = self.query_sql(predicates)
+        return [row[-1] for row in self.connection.execute("EXPLAIN QUERY PLAN " + sql, parameters)]
+
+    def update_patient(self, key: int, patient: Patient)-> bool:
+        """
+        updates the desired patient's fields to given fields, moving its notes along if the phn changed. returns true.
+        nothing is written if none of the patient's fields changed
+        """
+        if not patient.get_dirty_fields():
+            return True
+        with self.connection:
+            self.connection.execute("UPDATE patients SET phn = ?, name = ?, birth_date = ?, phone = ?, email = ?, address = ?, name_key = ?, phone_key = ?, email_key = ? "
+                                    "WHERE phn = ?",
+                                    (patient.get_phn(), patient.get_name(), patient.get_bday(), patient.get_phone(), patient.get_email(), patient.get_address(),
+                                     patient.get_name_key(), phone_key(patient.get_phone()), email_key(patient.get_email()), key))
+            if key != patient.get_phn():
+                self.connection.execute("UPDATE notes SET phn = ? WHERE phn = ?", (patient.get_phn(), key))
+                self.connection.execute("UPDATE note_words SET phn = ? WHERE phn = ?", (patient.get_phn(), key))
+        patient.clear_dirty()
+        self.search_cache.invalidate()
+        if self.fuzzy_index is not None:
+            if key != patient.get_phn():
+                self.fuzzy_index.remove(key)
+            self.fuzzy_index.add(patient.get_phn(), patient.get_name_key())
+        if key != patient.get_phn():
+            patient.set_patient_rec(PatientRecord(self.autosave, patient.get_phn(), self.note_dao_factory))
+        return True
+
+    def list_patients(self)-> list[Patient]:
+        """
+        returns a list of all Patients
+        """
+        rows = self.connection.execute("SELECT phn, name, birth_date, phone, email, address FROM patients")
+        return [self.to_patient(row) for row in rows]
+
+    def iter_patients(self):
+        """
+        yields all Patients one at a time, reading them from the database as they are needed
+        """
+        rows = self.connection.execute("SELECT phn, name, birth_date, phone, email, address FROM patients")
+        for row in rows:
+            yield self.to_patient(row)
+
+    def delete_patient(self, key: int)-> bool:
+        """
+        deletes corresponding patient and its notes and returns True
+        """
+        with self.connection:
+            self.connection.execute("DELETE FROM notes WHERE phn = ?", (key,))
+            self.connection.execute("DELETE FROM note_words WHERE phn = ?", (key,))
+            self.connection.execute("DELETE FROM patients WHERE phn = ?", (key,))
+        self.search_cache.invalidate()
+        self.note_search_cache.invalidate(key)
+        if self.fuzzy_index is not None:
+            self.fuzzy_index.remove(key)
+        return True
@@ -0,0 +1,112 @@
+from clinic.search_key import phone_key, email_key
+import bisect
+import math
+
+class PatientFieldIndex:
+    """
+    secondary indexes over the fields of patients: hash indexes from the phone and email keys to phns, see phone_key and
+    email_key, and a list of (birth_date, phn) kept sorted so a range of birth dates is found by bisection.
+    birth dates are "YYYY-MM-DD" strings, which sort in date order
+    """
+    def __init__(self) -> None:
+        """
+        initializes an empty index
+        """
+        # phone key -> phns of the patients having it
+        self.phones = {}
+        # email key -> phns of the patients having it
+        self.emails = {}
+        # sorted (birth_date, phn) of every patient
+        self.birth_dates = []
+        # phn -> (phone key, email key, birth_date) the patient is indexed under
+        self.fields = {}
+
+    @classmethod
+    def build(cls, patients) -> 'PatientFieldIndex':
+        """
+        returns an index of the fields of the given patients
+        """
+        index = cls()
+        entries = []
+        for patient in patients:
+            fields = (phone_key(patient.get_phone()), email_key(patient.get_email()), patient.get_bday())
+            index.fields[patient.get_phn()] = fields
+            index.phones.setdefault(fields[0], set()).add(patient.get_phn())
+            index.emails.setdefault(fields[1], set()).add(patient.get_phn())
+            entries.append((fields[2], patient.get_phn()))
+        entries.sort()
+        index.birth_dates = entries
+        return index
+
+    def add(self, phn: int, phone: str, email: str, birth_date: str) -> None:
+        """
+        adds the patient with the given phn and fields, replacing its previous fields if it was already indexed
+        """
+        self.remove(phn)
+        fields = (phone_key(phone), email_key(email), birth_date)
+        self.fields[phn] = fields
+        self.phones.setdefault(fields[0], set()).add(phn)
+        self.emails.setdefault(fields[1], set()).add(phn)
+        bisect.insort(self.birth_dates, (birth_date, phn))
+
+    def remove(self, phn: int) -> None:
+        """
+        removes the patient with the given phn
+        """
+        fields = self.fields.pop(phn, None)
+        if fields is None:
+            return
+        for keys, key in ((self.phones, fields[0]), (self.emails, fields[1])):
+            phns = keys[key]
+            phns.discard(phn)
+            if not phns:
+                del keys[key]
+        del self.birth_dates[bisect.bisect_left(self.birth_dates, (fields[2], phn))]
+
+    def phone_phns(self, phone: str) -> set[int]:
+        """
+        returns the set of phns of the patients with the given phone number, which must not be changed.
+        a number without digits matches nobody
+        """
+        key = phone_key(phone)
+        if not key:
+            return set()
+        return self.phones.get(key, set())
+
+    def email_phns(self, email: str) -> set[int]:
+        """
+        returns the set of phns of the patients with the given email address, ignoring case, which must not be changed.
+        an empty address matches nobody
+        """
+        key = email_key(email)
+        if not key:
+            return set()
+        return self.emails.get(key, set())
+
+    def find_phone(self, phone: str) -> list[int]:
+        """
+        returns the phns of the patients with the given phone number, in phn order
+        """
+        return sorted(self.phone_phns(phone))
+
+    def find_email(self, email: str) -> list[int]:
+        """
+        returns the phns of the patients with the given email address, ignoring case, in phn order
+        """
+        return sorted(self.email_phns(email))
+
+    def birth_date_bounds(self, start: str, end: str) -> tuple[int, int]:
+        """
+        returns the positions in birth_dates of the first patient born on or after start and past the last one born
+        on or before end, so their difference counts the patients born in the range
+        """
+        low = bisect.bisect_left(self.birth_dates, (start,))
+        high = bisect.bisect_right(self.birth_dates, (end, math.inf))
+        return low, high
+
+    def range_birth_date(self, start: str, end: str) -> list[int]:
+        """
+        returns the phns of the patients born from start to end, both included, by birth date and then phn
+        """
+        low, high = self.birth_date_bounds(start, end)
+        return [phn for birth_date, phn in self.birth_dates[low:high]]
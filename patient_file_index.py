@@ -0,0 +1,182 @@
+from clinic.patient import Patient
+from .patient_decoder import PatientDecoder
+from .patient_encoder import PatientEncoder
+from .atomic_write import atomic_write
+from collections.abc import MutableMapping
+import json
+import mmap
+import os
+import re
+
+class PatientFileIndex(MutableMapping):
+    """
+    a patient directory over a memory mapped patients.json, where each patient is only decoded when it is accessed.
+    the byte offset and length of each line are kept in a sidecar index file, so opening the directory does not
+    decode any patient
+    """
+    PHN = re.compile(rb'"phn":\s*(-?\d+)')
+
+    def __init__(self, patients_file: str, index_file: str, note_dao_factory = None, durability: str = "fsync") -> None:
+        """
+        maps patients_file and loads the offsets of its patients from index_file,
+        rebuilding the index if it is missing or does not match patients_file.
+        both files are written with the given durability level
+        """
+        self.patients_file = patients_file
+        self.durability = durability
+        self.index_file = index_file
+        self.decoder = PatientDecoder(note_dao_factory=note_dao_factory)
+        self.file = None
+        self.map = None
+        # the (offset, length) of the line of each patient in patients_file
+        self.offsets = {}
+        # values are either a decoded Patient or the (offset, length) of its line in patients_file
+        self.entries = {}
+        self.open_map()
+        if not self.load_index():
+            self.build_index()
+            self.save_index()
+
+    def open_map(self) -> None:
+        """
+        memory maps patients_file, if it exists and is not empty
+        """
+        try:
+            self.file = open(self.patients_file, 'rb')
+        except FileNotFoundError:
+            return
+        if os.fstat(self.file.fileno()).st_size > 0:
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def close_map(self) -> None:
+        """
+        unmaps and closes patients_file
+        """
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def file_stamp(self) -> list[int]:
+        """
+        returns the size and modification time of patients_file, used to detect a stale index
+        """
+        if self.file is None:
+            return [0, 0]
+        stat = os.fstat(self.file.fileno())
+        return [stat.st_size, stat.st_mtime_ns]
+
+    def load_index(self) -> bool:
+        """
+        loads the offsets from the index file and returns True, or returns False if the index is missing or stale
+        """
+        try:
+            with open(self.index_file, 'r') as file:
+                if json.loads(file.readline()) != self.file_stamp():
+                    return False
+                for line in file:
+                    phn, offset, length = line.split()
+                    self.offsets[int(phn)] = (int(offset), int(length))
+            self.entries = dict(self.offsets)
+            return True
+        except (FileNotFoundError, ValueError):
+            self.offsets = {}
+            return False
+
+    def build_index(self) -> None:
+        """
+        scans patients_file for the offset and length of each line, reading only the phn of each patient
+        """
+        self.offsets = {}
+        self.entries = {}
+        if self.map is None:
+            return
+        offset = 0
+        size = len(self.map)
+        while offset < size:
+            end = self.map.find(b'\n', offset)
+            if end == -1:
+                end = size
+            match = self.PHN.search(self.map, offset, end)
+            if match is not None:
+                self.offsets[int(match.group(1))] = (offset, end - offset)
+            offset = end + 1
+        self.entries = dict(self.offsets)
+
+    def save_index(self) -> None:
+        """
+        writes the offsets to the index file, headed by the stamp of patients_file
+        """
+        with atomic_write(self.index_file, 'w', self.durability) as file:
+            file.write(json.dumps(self.file_stamp()) + '\n')
+            for phn, entry in self.offsets.items():
+                file.write('%d %d %d\n' % (phn, entry[0], entry[1]))
+
+    def save(self) -> None:
+        """
+        rewrites patients_file with the current directory and rebuilds the index.
+        patients that were never decoded are copied from the mapped file as they are
+        """
+        offsets = {}
+        # writing in place would truncate the file under the map, so it is always replaced
+        durability = "flush" if self.durability == "none" else self.durability
+        with atomic_write(self.patients_file, 'wb', durability) as file:
+            for phn, entry in self.entries.items():
+                if isinstance(entry, Patient):
+                    line = json.dumps(entry, cls=PatientEncoder).encode('utf-8')
+                else:
+                    line = self.map[entry[0]:entry[0] + entry[1]]
+                offsets[phn] = (file.tell(), len(line))
+                file.write(line)
+                file.write(b'\n')
+            # the mapped file is replaced when the block exits, which windows refuses while it is still mapped
+            self.close_map()
+        self.open_map()
+        self.offsets = offsets
+        for phn, entry in offsets.items():
+            if not isinstance(self.entries[phn], Patient):
+                self.entries[phn] = entry
+        self.save_index()
+
+    def __getitem__(self, key: int) -> Patient:
+        """
+        returns the patient with the given phn, decoding it from the mapped file on first access
+        """
+        entry = self.entries[key]
+        if isinstance(entry, Patient):
+            return entry
+        patient = json.loads(self.map[entry[0]:entry[0] + entry[1]], object_hook=self.decoder.object_hook)
+        self.entries[key] = patient
+        return patient
+
+    def __setitem__(self, key: int, patient: Patient) -> None:
+        """
+        adds or replaces the patient with the given phn
+        """
+        self.entries[key] = patient
+
+    def __delitem__(self, key: int) -> None:
+        """
+        removes the patient with the given phn without decoding it
+        """
+        del self.entries[key]
+
+    def __contains__(self, key: int) -> bool:
+        """
+        returns True if there is a patient with the given phn, without decoding it
+        """
+        return key in self.entries
+
+    def __iter__(self):
+        """
+        iterates over the phns of the directory in file order
+        """
+        return iter(self.entries)
+
+    def __len__(self) -> int:
+        """
+        returns the number of patients in the directory
+        """
+        return len(self.entries)
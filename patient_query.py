@@ -0,0 +1,164 @@
+from clinic.search_key import search_key, phone_key, email_key
+
+# predicate -> what it matches, the keyword arguments of query_patients
+PREDICATES = {
+    "name": "name contains the value, ignoring case and accents",
+    "phone": "phone number is the value, comparing only digits",
+    "phone_ends_with": "phone number ends with the digits of the value",
+    "email": "email address is the value, ignoring case",
+    "born_from": "born on or after the \"YYYY-MM-DD\" value",
+    "born_to": "born on or before the \"YYYY-MM-DD\" value",
+    "born_in": "born in the year of the value",
+}
+FIRST_DATE = "0000-01-01"
+LAST_DATE = "9999-12-31"
+# an index whose candidates are at most this many times those already found is intersected with them,
+# a less selective one is cheaper to check on each candidate as a filter
+INTERSECT_RATIO = 4
+
+def parse_predicates(predicates: dict) -> dict:
+    """
+    returns the predicates of a query with their values in the form they are compared in, with born_in and the
+    born_from and born_to bounds merged into one range. unknown predicates raise ValueError
+    """
+    for name in predicates:
+        if name not in PREDICATES:
+            raise ValueError("unknown predicate %r, expected one of %s" % (name, ", ".join(PREDICATES)))
+    parsed = {}
+    if "name" in predicates:
+        parsed["name"] = search_key(predicates["name"])
+    if "phone" in predicates:
+        parsed["phone"] = phone_key(predicates["phone"])
+    if "phone_ends_with" in predicates:
+        parsed["phone_ends_with"] = phone_key(predicates["phone_ends_with"])
+    if "email" in predicates:
+        parsed["email"] = email_key(predicates["email"])
+    start = predicates.get("born_from", FIRST_DATE)
+    end = predicates.get("born_to", LAST_DATE)
+    if "born_in" in predicates:
+        year = int(predicates["born_in"])
+        start = max(start, "%04d-01-01" % year)
+        end = min(end, "%04d-12-31" % year)
+    if "born_from" in predicates or "born_to" in predicates or "born_in" in predicates:
+        parsed["birth_date"] = (start, end)
+    return parsed
+
+def matches(patient, name: str, value) -> bool:
+    """
+    returns True if patient satisfies the parsed predicate name with the given value
+    """
+    if name == "name":
+        return value in patient.get_name_key()
+    if name == "phone":
+        return bool(value) and phone_key(patient.get_phone()) == value
+    if name == "phone_ends_with":
+        return phone_key(patient.get_phone()).endswith(value)
+    if name == "email":
+        return bool(value) and email_key(patient.get_email()) == value
+    return value[0] <= patient.get_bday() <= value[1]
+
+def describe(name: str, value) -> str:
+    """
+    returns the parsed predicate name with the given value as written in a plan
+    """
+    if name == "birth_date":
+        return "birth_date %s..%s" % value
+    return "%s %r" % (name, value)
+
+class PatientQueryPlan:
+    """
+    the plan of a query on the patients of a PatientDAOJSON. each predicate that an index answers is estimated by the
+    number of patients the index gives for it. the candidates are those of the most selective index, then the indexes
+    at most INTERSECT_RATIO times less selective are intersected with them, and the remaining predicates are checked
+    on each candidate as filters. with no usable index every patient is scanned
+    """
+    def __init__(self, predicates: dict, patients: dict, name_index, field_index) -> None:
+        """
+        plans the query of the given parsed predicates over patients, a dictionary from phn to Patient,
+        with the NameTrigramIndex and PatientFieldIndex of the dao
+        """
+        self.patients = patients
+        self.name_index = name_index
+        self.field_index = field_index
+        indexed = []
+        self.filters = []
+        for name, value in predicates.items():
+            estimate = self.estimate(name, value)
+            if estimate is None:
+                self.filters.append((name, value))
+            else:
+                indexed.append((estimate, name, value))
+        indexed.sort(key=lambda step: step[0])
+        # (estimate, name, value) of the index giving the candidates and of those intersected with them
+        self.access = indexed[:1]
+        for step in indexed[1:]:
+            if step[0] <= INTERSECT_RATIO * indexed[0][0]:
+                self.access.append(step)
+            else:
+                self.filters.append(step[1:])
+        # number of candidates left after each step, filled in by execute
+        self.counts = None
+
+    def estimate(self, name: str, value) -> int:
+        """
+        returns the number of patients the index of a predicate gives for value, or None if no index answers it
+        """
+        if name == "name":
+            return self.name_index.estimate(value)
+        if name == "phone":
+            return len(self.field_index.phone_phns(value))
+        if name == "email":
+            return len(self.field_index.email_phns(value))
+        if name == "birth_date":
+            low, high = self.field_index.birth_date_bounds(*value)
+            return high - low
+        return None
+
+    def lookup(self, name: str, value) -> set[int]:
+        """
+        returns the set of phns the index of a predicate gives for value
+        """
+        if name == "name":
+            return self.name_index.matching(value)
+        if name == "phone":
+            return self.field_index.phone_phns(value)
+        if name == "email":
+            return self.field_index.email_phns(value)
+        return set(self.field_index.range_birth_date(*value))
+
+    def execute(self) -> list[int]:
+        """
+        runs the plan and returns the phns of the matching patients in phn order
+        """
+        self.counts = []
+        if self.access:
+            phns = set(self.lookup(*self.access[0][1:]))
+            self.counts.append(len(phns))
+            for estimate, name, value in self.access[1:]:
+                phns.intersection_update(self.lookup(name, value))
+                self.counts.append(len(phns))
+        else:
+            phns = list(self.patients)
+            self.counts.append(len(phns))
+        found = sorted(phns)
+        for name, value in self.filters:
+            found = [phn for phn in found if matches(self.patients[phn], name, value)]
+            self.counts.append(len(found))
+        return found
+
+    def explain(self) -> list[str]:
+        """
+        returns one line per step of the plan, with the estimated number of patients of each index
+        and, once the plan has run, the number of candidates left after each step
+        """
+        lines = []
+        if self.access:
+            for i, (estimate, name, value) in enumerate(self.access):
+                lines.append("%s %s: estimated %d" % ("index" if i == 0 else "intersect", describe(name, value), estimate))
+        else:
+            lines.append("scan all patients")
+        for name, value in self.filters:
+            lines.append("filter %s" % describe(name, value))
+        if self.counts is not None:
+            lines = ["%s, %s %d" % (line, "left" if i else "found", count) for i, (line, count) in enumerate(zip(lines, self.counts))]
+        return lines
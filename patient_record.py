@@ -1,86 +1,116 @@
-from .dao.note_dao_pickle import NoteDAOPickle
-from .note import Note
-class PatientRecord:
-    def __init__(self, autosave: bool, phn: int)-> None:
-        """
-        initializes attributes of PatientRecord instance
-        """
-        self.note_dao = NoteDAOPickle(autosave, phn)
-
-    def __eq__(self, other: 'PatientRecord')-> bool:
-        """
-        returns True if self PatientRecord has the same autocounter and notes
-        as other PatientRecord, otherwise returns False
-        """
-        return (self.note_dao.autocounter == other.get_autocounter()
-                and self.note_dao.notes == other.get_notes())
-    
-    def __str__(self) -> str:
-        """
-        returns a readable string with autocounter of self PatientRecord
-        """
-        return f'This patient record has {self.note_dao.autocounter} note(s)'
-    
-    def get_autocounter(self)-> int:
-        """
-        calls and returns get_autocounter method in NoteDAOPickle
-        """
-        return self.note_dao.get_autocounter()
-
-    def set_autocounter(self, val: int)-> None:
-        """
-        calls set_autocounter method in NoteDAOPickle
-        """
-        self.note_dao.set_autocounter(val)
-
-    def get_notes(self)-> dict[int, Note]:
-        """
-        calls and returns NoteDAOPickle get_notes method
-        """
-        return self.note_dao.get_notes()
-
-    def set_notes(self, new_notes: dict[int, str])-> None:
-        """
-        calls set_notes method in NoteDAOPickle
-        """
-        self.note_dao.set_notes(new_notes)
-
-    def create_note(self, text: str)-> Note:
-        """
-        calls and returns create_note method in NoteDAOPickle
-        """
-        return self.note_dao.create_note(text)
-
-    def search_note(self, code: int)-> Note:
-        """
-        calls and returns search_note method in NoteDAOPickle
-        """
-        return self.note_dao.search_note(code)
-
-
-    def retrieve_notes(self, keyword: str)-> list[Note]:
-        """
-        calls and returns retrieve_note method in PNoteDAOPickle
-        """
-        return self.note_dao.retrieve_notes(keyword)
-
-
-    def update_note(self, code: int, text: str)-> bool:
-        """
-        calls and returns update_note method in NoteDAOPickle
-        """
-        return self.note_dao.update_note(code, text)
-
-
-    def delete_note(self, code: int)-> bool:
-        """
-        calls and returns delete_note method in NoteDAOPickle
-        """
-        return self.note_dao.delete_note(code)
-
-
-    def list_notes(self)-> list[Note]:
-        """
-        calls and returns list_notes method in NoteDAOPickle
-        """
-        return self.note_dao.list_notes()
\ No newline at end of file
+from .dao.note_dao_pickle import NoteDAOPickle
+from .note import Note
+class PatientRecord:
+    def __init__(self, autosave: bool, phn: int, note_dao_factory = None)-> None:
+        """
+        initializes attributes of PatientRecord instance.
+        note_dao_factory is called with (autosave, phn) to create the note dao, NoteDAOPickle is used if none is given.
+        the note dao is only created the first time it is accessed, so loading a patient does not open its record file
+        """
+        if note_dao_factory is None:
+            note_dao_factory = NoteDAOPickle
+        self.autosave = autosave
+        self.phn = phn
+        self.note_dao_factory = note_dao_factory
+        self.loaded_note_dao = None
+
+    @property
+    def note_dao(self):
+        """
+        returns the note dao of self PatientRecord, creating it on first access
+        """
+        if self.loaded_note_dao is None:
+            self.loaded_note_dao = self.note_dao_factory(self.autosave, self.phn)
+        return self.loaded_note_dao
+
+    def __eq__(self, other: 'PatientRecord')-> bool:
+        """
+        returns True if self PatientRecord has the same autocounter and notes
+        as other PatientRecord, otherwise returns False
+        """
+        return (self.note_dao.autocounter == other.get_autocounter()
+                and self.note_dao.notes == other.get_notes())
+    
+    def __str__(self) -> str:
+        """
+        returns a readable string with autocounter of self PatientRecord
+        """
+        return f'This patient record has {self.note_dao.autocounter} note(s)'
+    
+    def flush(self)-> None:
+        """
+        writes any pending changes of the note dao, if it has been created
+        """
+        if self.loaded_note_dao is not None:
+            self.loaded_note_dao.flush()
+
+    def release_note_dao(self)-> None:
+        """
+        writes any pending changes and drops the note dao, so its notes can be freed until it is accessed again
+        """
+        self.flush()
+        self.loaded_note_dao = None
+
+    def get_autocounter(self)-> int:
+        """
+        calls and returns get_autocounter method in NoteDAOPickle
+        """
+        return self.note_dao.get_autocounter()
+
+    def set_autocounter(self, val: int)-> None:
+        """
+        calls set_autocounter method in NoteDAOPickle
+        """
+        self.note_dao.set_autocounter(val)
+
+    def get_notes(self)-> dict[int, Note]:
+        """
+        calls and returns NoteDAOPickle get_notes method
+        """
+        return self.note_dao.get_notes()
+
+    def set_notes(self, new_notes: dict[int, str])-> None:
+        """
+        calls set_notes method in NoteDAOPickle
+        """
+        self.note_dao.set_notes(new_notes)
+
+    def create_note(self, text: str)-> Note:
+        """
+        calls and returns create_note method in NoteDAOPickle
+        """
+        return self.note_dao.create_note(text)
+
+    def search_note(self, code: int)-> Note:
+        """
+        calls and returns search_note method in NoteDAOPickle
+        """
+        return self.note_dao.search_note(code)
+
+
+    def retrieve_notes(self, keyword: str, whole_words: bool = False)-> list[Note]:
+        """
+        calls and returns retrieve_note method in PNoteDAOPickle
+        """
+        return self.note_dao.retrieve_notes(keyword, whole_words)
+
+
+    def update_note(self, code: int, text: str)-> bool:
+        """
+        calls and returns update_note method in NoteDAOPickle
+        """
+        return self.note_dao.update_note(code, text)
+
+
+    def delete_note(self, code: int)-> bool:
+        """
+        calls and returns delete_note method in NoteDAOPickle
+        """
+        return self.note_dao.delete_note(code)
+
+
+    def list_notes(self, offset: int = 0, limit: int = None, newest_first: bool = True)-> list[Note]:
+        """
+        calls and returns list_notes method in NoteDAOPickle
+        """
+        return self.note_dao.list_notes(offset, limit, newest_first)
\ No newline at end of file
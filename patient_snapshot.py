@@ -0,0 +1,103 @@
+from clinic.patient import Patient
+from .patient_decoder import PatientDecoder
+from .patient_encoder import PatientEncoder
+from .atomic_write import atomic_write
+import json
+import struct
+import zlib
+
+# file layout, all integers little endian:
+#   header   magic, format version, flags (unused), number of patients
+#   table    one fixed size entry per patient: phn followed by the byte lengths of
+#            name, birth_date, phone, email and address
+#   fields   the five fields of every patient as utf-8, in table order
+#   trailer  crc32 of everything before it
+# keeping the fixed size entries together lets them be unpacked in one pass,
+# and the fields can be decoded at once when they are all ascii
+MAGIC = b'CLPS'
+VERSION = 1
+HEADER = struct.Struct('<4sHHQ')
+RECORD = struct.Struct('<qIIIII')
+TRAILER = struct.Struct('<I')
+
+def write_snapshot(path: str, patients, durability: str = "fsync") -> None:
+    """
+    writes the given patients to path in the binary snapshot format
+    """
+    patients = list(patients)
+    table = [HEADER.pack(MAGIC, VERSION, 0, len(patients))]
+    fields = []
+    for patient in patients:
+        name = patient.name.encode('utf-8')
+        bday = patient.birth_date.encode('utf-8')
+        phone = patient.phone.encode('utf-8')
+        email = patient.email.encode('utf-8')
+        address = patient.address.encode('utf-8')
+        table.append(RECORD.pack(patient.phn, len(name), len(bday), len(phone), len(email), len(address)))
+        fields.extend((name, bday, phone, email, address))
+    data = b''.join(table) + b''.join(fields)
+    with atomic_write(path, 'wb', durability) as file:
+        file.write(data)
+        file.write(TRAILER.pack(zlib.crc32(data)))
+
+def read_snapshot(path: str, note_dao_factory = None) -> dict[int, Patient]:
+    """
+    returns the patient directory stored at path in the binary snapshot format.
+    raises ValueError if the file is not a snapshot, has an unsupported version or fails its checksum
+    """
+    with open(path, 'rb') as file:
+        data = file.read()
+    if len(data) < HEADER.size + TRAILER.size:
+        raise ValueError("%s is too short to be a patient snapshot" % path)
+    magic, version, flags, count = HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError("%s is not a patient snapshot" % path)
+    if version != VERSION:
+        raise ValueError("%s has unsupported snapshot version %d" % (path, version))
+    end = len(data) - TRAILER.size
+    if zlib.crc32(memoryview(data)[:end]) != TRAILER.unpack_from(data, end)[0]:
+        raise ValueError("%s failed its checksum" % path)
+    table_end = HEADER.size + count * RECORD.size
+    if table_end > end:
+        raise ValueError("%s is truncated" % path)
+    heap = data[table_end:end]
+    # byte lengths are character lengths when every field is ascii, so the fields can be sliced from one decoded string
+    if heap.isascii():
+        heap = heap.decode('ascii')
+        decode = str
+    else:
+        decode = lambda field: field.decode('utf-8')
+    patients = {}
+    offset = 0
+    for phn, name_len, bday_len, phone_len, email_len, address_len in RECORD.iter_unpack(data[HEADER.size:table_end]):
+        name_end = offset + name_len
+        bday_end = name_end + bday_len
+        phone_end = bday_end + phone_len
+        email_end = phone_end + email_len
+        address_end = email_end + address_len
+        patients[phn] = Patient(phn, decode(heap[offset:name_end]), decode(heap[name_end:bday_end]), decode(heap[bday_end:phone_end]),
+                                decode(heap[phone_end:email_end]), decode(heap[email_end:address_end]), note_dao_factory=note_dao_factory)
+        offset = address_end
+    return patients
+
+def json_to_snapshot(json_path: str, snapshot_path: str, durability: str = "fsync") -> None:
+    """
+    converts a line-delimited patients.json file into a binary snapshot
+    """
+    patients = []
+    with open(json_path, 'r') as file:
+        decoder = PatientDecoder()
+        for line in file:
+            if line.strip():
+                patients.append(json.loads(line.strip(), object_hook=decoder.object_hook))
+    write_snapshot(snapshot_path, patients, durability)
+
+def snapshot_to_json(snapshot_path: str, json_path: str, durability: str = "fsync") -> None:
+    """
+    converts a binary snapshot into a line-delimited patients.json file
+    """
+    patients = read_snapshot(snapshot_path)
+    with atomic_write(json_path, 'w', durability) as file:
+        for patient in patients.values():
+            json.dump(patient, file, cls=PatientEncoder)
+            file.write('\n')
@@ -0,0 +1,83 @@
+from collections import OrderedDict
+import itertools
+import threading
+
+class SearchCache:
+    """
+    a bounded least recently used cache of search results. results are kept per scope, such as the phn of a patient
+    whose notes were searched, and every change to the data of a scope invalidates it, dropping its results. each
+    scope with results or a search running has a generation that an invalidation discards, so the results of a
+    search that ran while its scope changed are not stored. the generations of scopes whose results are all dropped
+    or evicted are discarded too, so the cache holds nothing for the scopes no longer searched
+    """
+    def __init__(self, max_size: int = 128) -> None:
+        """
+        initializes an empty cache holding at most max_size results. a max_size of 0 caches nothing
+        """
+        if max_size < 0:
+            raise ValueError("max_size must not be negative")
+        self.max_size = max_size
+        # (scope, key) -> results, least recently used first
+        self.entries = OrderedDict()
+        # scope -> keys of its entries
+        self.scopes = {}
+        # scope -> generation, taken from one counter so a scope dropped and searched again never reuses a generation
+        self.generations = {}
+        self.counter = itertools.count(1)
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def invalidate(self, scope = None) -> None:
+        """
+        drops the results cached for scope and its generation, so a search of scope still running does not store its results
+        """
+        with self.lock:
+            self.drop(scope)
+
+    def drop(self, scope) -> None:
+        """
+        drops the results and the generation of scope, the lock must be held
+        """
+        self.generations.pop(scope, None)
+        for key in self.scopes.pop(scope, ()):
+            del self.entries[(scope, key)]
+
+    def lookup(self, key, search, scope = None) -> list:
+        """
+        returns a copy of the results cached for key in scope, or calls search, caches its results and returns them.
+        key must be the normalized query, so equivalent queries share their results
+        """
+        with self.lock:
+            results = self.entries.get((scope, key))
+            if results is not None:
+                self.entries.move_to_end((scope, key))
+                self.hits += 1
+                return list(results)
+            self.misses += 1
+            if scope not in self.generations:
+                self.generations[scope] = next(self.counter)
+            generation = self.generations[scope]
+        results = search()
+        with self.lock:
+            if self.generations.get(scope) != generation:
+                return results
+            if self.max_size > 0:
+                self.entries[(scope, key)] = list(results)
+                self.entries.move_to_end((scope, key))
+                self.scopes.setdefault(scope, set()).add(key)
+                while len(self.entries) > self.max_size:
+                    (old_scope, old_key), old_results = self.entries.popitem(last=False)
+                    self.scopes[old_scope].discard(old_key)
+                    if not self.scopes[old_scope]:
+                        self.drop(old_scope)
+            elif scope not in self.scopes:
+                self.generations.pop(scope, None)
+        return results
+
+    def stats(self) -> dict[str, int]:
+        """
+        returns the number of hits, misses and cached results
+        """
+        with self.lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self.entries)}
@@ -0,0 +1,28 @@
+import unicodedata
+
+def search_key(text: str) -> str:
+    """
+    returns the form of text that searches compare: casefolded, NFKC normalized and without accents,
+    so "Élise", "ELISE" and "élise" all give "elise". text that is already its own key is returned as is,
+    so the key of a lowercase ascii name shares its string
+    """
+    if text.isascii():
+        key = text.lower()
+    else:
+        decomposed = unicodedata.normalize('NFKD', text.casefold())
+        key = unicodedata.normalize('NFKC', "".join(char for char in decomposed if not unicodedata.combining(char)))
+    if key == text:
+        return text
+    return key
+
+def phone_key(phone: str) -> str:
+    """
+    returns the digits of a phone number, which phone lookups compare, so "250 555 0101" and "(250) 555-0101" match
+    """
+    return "".join(char for char in phone if char.isdigit())
+
+def email_key(email: str) -> str:
+    """
+    returns the form of an email address that email lookups compare, without surrounding spaces and lowercased
+    """
+    return email.strip().lower()
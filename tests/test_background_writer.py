@@ -0,0 +1,54 @@
+from clinic.dao.background_writer import BackgroundWriter
+from clinic.dao.note_dao_pickle import NoteDAOPickle
+from unittest import TestCase, main
+import os
+import shutil
+import tempfile
+import threading
+
+class SlowNoteDAO(NoteDAOPickle):
+    """
+    a note dao whose writes signal started and wait briefly before taking the lock, so a save stays in flight
+    """
+    def __init__(self, phn: int, writer: BackgroundWriter, started: threading.Event) -> None:
+        super().__init__(True, phn, durability="none", writer=writer)
+        self.started = started
+
+    def save_notes(self) -> None:
+        self.started.set()
+        threading.Event().wait(0.2)
+        super().save_notes()
+
+class BackgroundWriterTest(TestCase):
+
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.directory = tempfile.mkdtemp()
+        os.chdir(self.directory)
+        os.makedirs(os.path.join("clinic", "records"))
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.directory)
+
+    def test_submit_with_full_queue_while_save_in_flight(self):
+        writer = BackgroundWriter(max_pending=1)
+        started = threading.Event()
+        first = SlowNoteDAO(9790010001, writer, started)
+        second = NoteDAOPickle(True, 9790010002, durability="none", writer=writer)
+        first.create_note("first note")
+        self.assertTrue(started.wait(5), "the write of the first note did not start")
+        # the writer is saving first, and the write of second fills the queue
+        second.create_note("second note")
+        creating = threading.Thread(target=first.create_note, args=("third note",), daemon=True)
+        creating.start()
+        creating.join(5)
+        self.assertFalse(creating.is_alive(), "create_note deadlocked with the background writer")
+        writer.close()
+        reloaded = NoteDAOPickle(True, 9790010001)
+        self.assertEqual([note.get_text() for note in reloaded.list_notes(newest_first=False)], ["first note", "third note"])
+        reloaded = NoteDAOPickle(True, 9790010002)
+        self.assertEqual([note.get_text() for note in reloaded.list_notes(newest_first=False)], ["second note"])
+
+if __name__ == '__main__':
+    main()